@@ -0,0 +1,83 @@
+"""
+Load test for the live dose event stream (`GET /api/logs/stream/`).
+
+Opens many idle subscribers on one event loop, each consuming the same
+`event_stream()` generator the view returns, and reports the memory
+cost per connection. It then publishes events and measures how long
+the broadcaster takes to reach every subscriber. Sockets and HTTP
+framing are not included, so the figures cover the application's share
+of the per-connection cost.
+
+Usage:
+    python -m benchmarks.bench_dose_event_stream --subscribers 10000 --owners 1000
+"""
+import argparse
+import asyncio
+import resource
+import time
+import tracemalloc
+
+from benchmarks.common import setup_django
+
+
+async def run(subscribers, owners, events):
+    from medtrackerapp.events import dose_events, event_stream
+
+    received = [0]
+    all_delivered = asyncio.Event()
+    expected = [0]
+
+    async def client(owner_id):
+        async for message in event_stream(owner_id, None, keepalive=3600):
+            if message.startswith("id:"):
+                received[0] += 1
+                if received[0] == expected[0]:
+                    all_delivered.set()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tasks = [asyncio.create_task(client(i % owners)) for i in range(subscribers)]
+    await asyncio.sleep(0.1)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Subscribers connected:  {dose_events.subscriber_count}")
+    print(f"Python heap per subscriber: {(after - before) / subscribers / 1024:.2f} KiB")
+    print(f"Peak process RSS:       {rss_mb:.1f} MiB")
+
+    per_owner = subscribers // owners
+    expected[0] = events * per_owner
+    start = time.perf_counter()
+    for i in range(events):
+        dose_events.publish({
+            "type": "created",
+            "owner": i % owners,
+            "log": {"id": i, "medication": 1, "taken_at": "2025-01-01T08:00:00Z", "was_taken": True},
+        })
+    await asyncio.wait_for(all_delivered.wait(), timeout=60)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Delivered {received[0]} messages ({events} events x {per_owner} subscribers/owner) "
+        f"in {elapsed * 1000:.1f} ms ({received[0] / elapsed:,.0f} msg/s)"
+    )
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"Subscribers after disconnect: {dose_events.subscriber_count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--owners", type=int, default=1_000)
+    parser.add_argument("--events", type=int, default=1_000)
+    args = parser.parse_args()
+
+    setup_django()
+    asyncio.run(run(args.subscribers, args.owners, args.events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark the local OpenFDA label mirror (`import_drug_labels`).
+
+Writes a synthetic bulk label file, imports it with the streaming
+management command into a test database, then times local lookups
+through `DrugInfoService.get_cached_drug_info()`.
+
+Usage:
+    python -m benchmarks.bench_drug_labels --labels 50000
+"""
+import argparse
+import io
+import json
+import random
+import string
+import tempfile
+import time
+
+from benchmarks.common import setup_django, test_database, timed
+
+
+def write_bulk_file(handle, count, rng):
+    names = []
+    handle.write('{"meta": {"results": {"skip": 0, "total": %d}}, "results": [' % count)
+    for i in range(count):
+        name = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(6, 12)))
+        names.append(name)
+        record = {
+            "id": f"label-{i}",
+            "effective_time": f"20{rng.randint(10, 24)}0101",
+            "openfda": {"generic_name": [name], "manufacturer_name": ["Synthetic Labs"]},
+            "purpose": ["Synthetic purpose " * 5],
+            "warnings": ["Synthetic warning text. " * 40],
+        }
+        handle.write(("," if i else "") + json.dumps(record))
+    handle.write("]}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--labels", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.test.utils import override_settings
+    from medtrackerapp.services import DrugInfoService
+
+    rng = random.Random(42)
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as handle, test_database():
+        names = write_bulk_file(handle, args.labels, rng)
+        handle.flush()
+
+        start = time.perf_counter()
+        call_command("import_drug_labels", handle.name, stdout=io.StringIO())
+        elapsed = time.perf_counter() - start
+        print(f"Imported {args.labels} labels in {elapsed:.1f} s ({args.labels / elapsed:,.0f} labels/s)")
+
+        sample = [rng.choice(names) for _ in range(args.lookups)]
+
+        def lookups():
+            for name in sample:
+                DrugInfoService.get_cached_drug_info(name)
+
+        with override_settings(DRUG_INFO_MODE="local"):
+            stats = timed(lookups, repeat=3)
+        print(
+            f"local lookup: {stats['best'] * 1000 / args.lookups:.1f} us/lookup "
+            f"(median {stats['median'] * 1000 / args.lookups:.1f} us)"
+        )
+
+
+if __name__ == "__main__":
+    main()
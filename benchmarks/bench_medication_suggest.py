@@ -0,0 +1,71 @@
+"""
+Benchmark medication name autocomplete (`MedicationNameIndex`).
+
+Builds the in-process index over a synthetic set of medication names
+and times prefix lookups of different selectivity, plus incremental
+inserts and removals as performed by the save/delete signal handlers.
+
+Usage:
+    python -m benchmarks.bench_medication_suggest --medications 100000
+"""
+import argparse
+import random
+import string
+import time
+
+from benchmarks.common import report, setup_django, timed
+
+
+def synthetic_names(count, rng):
+    names = set()
+    while len(names) < count:
+        length = rng.randint(5, 14)
+        names.add(rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=length)))
+    return sorted(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--medications", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from medtrackerapp.autocomplete import MedicationNameIndex
+
+    rng = random.Random(42)
+    names = synthetic_names(args.medications, rng)
+    index = MedicationNameIndex()
+
+    start = time.perf_counter()
+    index.load((pk, name, None) for pk, name in enumerate(names, start=1))
+    print(f"Built index of {args.medications} names in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for prefix_length in (1, 2, 3, 5):
+        prefixes = [rng.choice(names)[:prefix_length] for _ in range(args.lookups)]
+
+        def lookups():
+            for prefix in prefixes:
+                index.suggest(prefix, 10)
+
+        stats = timed(lookups, repeat=3)
+        per_lookup = {key: value * 1000 / args.lookups for key, value in stats.items()}
+        print(
+            f"prefix length {prefix_length}: "
+            f"{per_lookup['best']:.2f} us/lookup (median {per_lookup['median']:.2f} us)"
+        )
+
+    next_id = args.medications + 1
+
+    def churn():
+        nonlocal next_id
+        for _ in range(1000):
+            index.add(next_id, rng.choice(names) + " XR")
+            index.remove(next_id)
+            next_id += 1
+
+    report("1000 add+remove pairs", timed(churn, repeat=3))
+
+
+if __name__ == "__main__":
+    main()
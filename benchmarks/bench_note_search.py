@@ -0,0 +1,76 @@
+"""
+Benchmark full-text note search (`Note.objects.search`).
+
+Loads a synthetic corpus of notes into a test database and times the
+first page of ranked search results, the way `GET /api/notes/search/`
+evaluates it. On PostgreSQL this exercises the trigger-maintained
+`tsvector` column and its GIN index; on other backends it measures the
+substring fallback.
+
+Usage:
+    python -m benchmarks.bench_note_search --notes 1000000
+"""
+import argparse
+import random
+
+from benchmarks.common import report, setup_django, test_database, timed
+
+WORDS = (
+    "food water morning evening dizziness headache nausea stomach sleep "
+    "appetite fatigue rash pain relief dose missed late early doctor "
+    "pharmacy refill mild severe better worse tired energy"
+).split()
+
+
+def populate(notes, batch_size=10_000):
+    from django.utils import timezone
+    from medtrackerapp.models import Medication, Note
+
+    medications = Medication.objects.bulk_create(
+        Medication(name=f"Medication {i}", dosage_mg=100, prescribed_per_day=2)
+        for i in range(100)
+    )
+    rng = random.Random(42)
+    now = timezone.now()
+    for offset in range(0, notes, batch_size):
+        Note.objects.bulk_create(
+            Note(
+                medication=rng.choice(medications),
+                text=" ".join(rng.choices(WORDS, k=12)),
+                created_at=now,
+            )
+            for _ in range(min(batch_size, notes - offset))
+        )
+    return medications
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database() as connection:
+        from medtrackerapp.models import Note
+
+        print(f"Loading {args.notes} notes ({connection.vendor})...")
+        medications = populate(args.notes)
+
+        def first_page(query, **filters):
+            return lambda: list(Note.objects.search(query).filter(**filters)[:20])
+
+        report("search 'headache'", timed(first_page("headache"), args.repeat))
+        report("search 'severe nausea'", timed(first_page("severe nausea"), args.repeat))
+        report(
+            "search 'refill' for one medication",
+            timed(first_page("refill", medication=medications[0]), args.repeat),
+        )
+        report(
+            "count 'headache'",
+            timed(lambda: Note.objects.search("headache").count(), args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark response size and encode time per dose log format.
+
+Serializes a synthetic history of dose logs the way `/api/logs/` does,
+then compares each renderer and compression option: bytes on the wire
+and time to encode (and compress) the response body.
+
+Usage:
+    python -m benchmarks.bench_response_formats --logs 100000
+"""
+import argparse
+import gzip
+import time
+from datetime import timedelta
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+    from medtrackerapp.middleware import brotli
+    from medtrackerapp.models import DoseLog, Medication
+    from medtrackerapp.renderers import ColumnarJSONRenderer, MessagePackRenderer
+    from medtrackerapp.serializers import DoseLogSerializer
+
+    medication = Medication(pk=1, name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+    start = timezone.now()
+    logs = [
+        DoseLog(pk=i, medication=medication, taken_at=start - timedelta(hours=12 * i), was_taken=i % 10 != 0)
+        for i in range(1, args.logs + 1)
+    ]
+    began = time.perf_counter()
+    data = DoseLogSerializer(logs, many=True).data
+    print(f"Serialized {args.logs:,} logs in {(time.perf_counter() - began) * 1000:.0f} ms")
+
+    renderers = {
+        "json": JSONRenderer(),
+        "msgpack": MessagePackRenderer(),
+        "columnar json": ColumnarJSONRenderer(),
+    }
+    compressors = {"identity": None, "gzip": lambda body: gzip.compress(body, 6)}
+    if brotli is not None:
+        compressors["br (q=4)"] = lambda body: brotli.compress(body, quality=4)
+
+    print(f"{'format':<16}{'encoding':<12}{'bytes':>14}{'encode ms':>12}{'compress ms':>13}")
+    for name, renderer in renderers.items():
+        began = time.perf_counter()
+        body = renderer.render(data)
+        encode_ms = (time.perf_counter() - began) * 1000
+        for encoding, compress in compressors.items():
+            compress_ms = 0.0
+            payload = body
+            if compress is not None:
+                began = time.perf_counter()
+                payload = compress(body)
+                compress_ms = (time.perf_counter() - began) * 1000
+            print(f"{name:<16}{encoding:<12}{len(payload):>14,}{encode_ms:>12.1f}{compress_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
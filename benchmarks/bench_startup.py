@@ -0,0 +1,81 @@
+"""
+Benchmark process startup cost using `python -X importtime`.
+
+Runs each scenario in a fresh interpreter several times and reports the
+wall-clock time, the total import time and the heaviest top-level
+imports. It also flags whether the HTTP client stack (`requests`) or
+the Django REST framework serializers were loaded. A worker or a
+`manage.py migrate` run should need neither. Web processes still load
+`requests`, because Django REST framework imports it when it is
+installed.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "django.setup() (workers, commands)": "import django; django.setup()",
+    "load medtrackerapp.models + tasks": (
+        "import django; django.setup(); import medtrackerapp.models, medtrackerapp.tasks"
+    ),
+    "load URLconf (web process)": (
+        "import django; django.setup(); from django.urls import resolve; resolve('/api/')"
+    ),
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+WATCHED = ("requests", "rest_framework.serializers")
+
+
+def run_once(code):
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "medtracker.settings")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+
+    top_level = []
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        loaded.add(module)
+        if indent <= 1:
+            top_level.append((cumulative, module))
+    total = sum(cumulative for cumulative, _ in top_level) / 1000
+    return elapsed, total, sorted(top_level, reverse=True)[:5], loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, code in SCENARIOS.items():
+        runs = [run_once(code) for _ in range(args.repeat)]
+        wall = statistics.median(run[0] for run in runs)
+        imports = statistics.median(run[1] for run in runs)
+        _, _, heaviest, loaded = runs[-1]
+        flags = ", ".join(f"{name}: {'yes' if name in loaded else 'no'}" for name in WATCHED)
+        print(f"{label}\n  wall {wall:7.1f} ms   imports {imports:7.1f} ms   ({flags})")
+        for cumulative, module in heaviest:
+            print(f"    {cumulative / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark the per-request overhead of rate limiting and admission control.
+
+Times `TokenBucketThrottle.allow_request()` on its own for each bucket
+store, then full `GET /api/logs/` requests with limiting enabled and
+disabled. Limits are set high enough that no request is rejected.
+
+Usage:
+    python -m benchmarks.bench_throttling --clients 1000
+"""
+import argparse
+
+from benchmarks.common import report, setup_django, test_database, timed
+
+GENEROUS = {"rate": 1e9, "burst": 1e9}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient, APIRequestFactory
+    from rest_framework.request import Request
+    from medtrackerapp.models import DoseLog, Medication
+    from medtrackerapp.throttling import TokenBucketThrottle
+    from medtrackerapp.views import DoseLogViewSet
+
+    factory = APIRequestFactory()
+    view = DoseLogViewSet(action="filter_by_date")
+    requests = [
+        Request(factory.get("/api/logs/filter/", REMOTE_ADDR=f"10.0.{i // 250}.{i % 250}"))
+        for i in range(args.clients)
+    ]
+    limits = {scope: GENEROUS for scope in ("read", "analytics", "write", "external")}
+
+    for backend in ("memory", "cache"):
+        with override_settings(RATE_LIMIT_BACKEND=backend, RATE_LIMITS=limits):
+            throttle = TokenBucketThrottle()
+
+            def checks():
+                for i in range(args.checks):
+                    throttle.allow_request(requests[i % args.clients], view)
+
+            stats = timed(checks, repeat=3)
+            print(f"{backend} store: {stats['best'] * 1000 / args.checks:.2f} us per check")
+
+    with test_database(), override_settings(ALLOWED_HOSTS=["testserver"]):
+        medication = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        DoseLog.objects.bulk_create(
+            DoseLog(medication=medication, taken_at="2025-01-01T08:00:00Z") for _ in range(20)
+        )
+        client = APIClient()
+        url = reverse("doselog-filter-by-date")
+        params = {"start": "2025-01-01", "end": "2025-01-31"}
+
+        def get_requests():
+            for _ in range(args.requests):
+                client.get(url, params)
+
+        for label, overrides in (
+            ("limiting disabled", {"RATE_LIMITS": {}, "CONCURRENCY_LIMITS": {}}),
+            ("limiting enabled (memory)", {"RATE_LIMITS": limits, "RATE_LIMIT_BACKEND": "memory"}),
+            ("limiting enabled (cache)", {"RATE_LIMITS": limits, "RATE_LIMIT_BACKEND": "cache"}),
+        ):
+            with override_settings(**overrides):
+                report(f"{args.requests} x GET /logs/filter/, {label}", timed(get_requests, repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway test database created from the
+configured `DATABASES` setting, so they never touch real data. Run them
+from the repository root, e.g.:
+
+    python -m benchmarks.bench_note_search --notes 1000000
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    """Configure Django using the project settings."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "medtracker.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a fresh test database for the duration of the block."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timed(func, repeat=5):
+    """
+    Run `func` several times and return timing statistics.
+
+    Returns:
+        dict: `best`, `median` and `worst` wall-clock times in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "worst": max(samples),
+    }
+
+
+def report(label, stats):
+    """Print one line of timing statistics."""
+    print(
+        f"{label:<40} best {stats['best']:9.3f} ms   "
+        f"median {stats['median']:9.3f} ms   worst {stats['worst']:9.3f} ms"
+    )
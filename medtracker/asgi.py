@@ -1,3 +1,10 @@
+"""
+ASGI entry point, e.g. `uvicorn medtracker.asgi:application`.
+
+Serve the project through ASGI when using the live dose event stream
+(`/api/logs/stream/`): it is an async view, so idle Server-Sent Events
+connections do not each tie up a worker thread as they would under WSGI.
+"""
 import os
 
 from django.core.asgi import get_asgi_application
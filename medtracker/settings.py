@@ -24,6 +24,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "medtrackerapp.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -63,10 +64,80 @@ DATABASES = {
     }
 }
 
+# Use a shared backend (database, Redis, Memcached) in production so that
+# drug info warmed by background workers is visible to web processes.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+REST_FRAMEWORK = {
+    "DEFAULT_THROTTLE_CLASSES": ["medtrackerapp.throttling.TokenBucketThrottle"],
+}
+
+# Rate limiting (medtrackerapp.throttling). Each endpoint class has a
+# per-client token bucket: `rate` requests per second sustained, up to
+# `burst` at once. "memory" keeps buckets per process, "cache" shares them
+# between processes through the default cache.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMITS = {
+    "read": {"rate": 20, "burst": 100},
+    "analytics": {"rate": 2, "burst": 20},
+    "write": {"rate": 10, "burst": 50},
+    "external": {"rate": 1, "burst": 10},
+}
+# Heavy requests allowed in flight per process before shedding with 503.
+CONCURRENCY_LIMITS = {
+    "analytics": int(os.getenv("ANALYTICS_MAX_IN_FLIGHT", "4")),
+}
+CONCURRENCY_RETRY_AFTER = 1
+
+# Drug information lookups: "local-first" answers from the DrugLabel mirror
+# (see `manage.py import_drug_labels`) and falls back to OpenFDA on misses,
+# "local" never calls OpenFDA, "remote" always does.
+DRUG_INFO_MODE = os.getenv("DRUG_INFO_MODE", "local-first")
+
+# Background jobs (see medtrackerapp/jobs.py and `manage.py process_jobs`).
+JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# Seconds without a heartbeat after which a running job is reclaimed, and
+# seconds `process_jobs` waits for running jobs on shutdown before
+# putting them back in the queue.
+JOB_LEASE_TIMEOUT = float(os.getenv("JOB_LEASE_TIMEOUT", "300"))
+JOB_SHUTDOWN_GRACE = float(os.getenv("JOB_SHUTDOWN_GRACE", "10"))
+EXPORT_ROOT = Path(os.getenv("EXPORT_ROOT", BASE_DIR / "exports"))
+# Rows deleted per transaction when purging a deleted medication's history.
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "5000"))
+
+# Live dose event streams (GET /api/logs/stream/). "local" fans out within
+# one process; "postgres" relays events between processes via LISTEN/NOTIFY.
+DOSE_EVENTS_BACKEND = os.getenv("DOSE_EVENTS_BACKEND", "local")
+DOSE_EVENTS_QUEUE_SIZE = int(os.getenv("DOSE_EVENTS_QUEUE_SIZE", "100"))
+DOSE_EVENTS_KEEPALIVE = float(os.getenv("DOSE_EVENTS_KEEPALIVE", "15"))
+
+# Response compression (medtrackerapp.middleware.CompressionMiddleware).
+# Brotli is used when the optional `brotli` package is installed.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Offline delta sync (GET /api/sync/): maximum rows per table per response.
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 
+# Medication name autocomplete: "database" queries the prefix index
+# directly, "memory" serves suggestions from an in-process sorted index
+# that is reloaded when another process publishes a change (this needs a
+# cache shared by all processes, see CACHES).
+MEDICATION_SUGGEST_BACKEND = os.getenv("MEDICATION_SUGGEST_BACKEND", "database")
+# Seconds between the "memory" index's checks for changes published by
+# other processes.
+MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL = float(os.getenv("MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL", "1.0"))
+
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
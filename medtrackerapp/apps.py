@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "medtrackerapp"
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "medication_names:version"
+
+
+class MedicationNameIndex:
+    """
+    In-process sorted index of medication names for prefix lookups.
+
+    Each owner (patient) has its own list of `(key, id, name)` tuples
+    sorted by the case-folded name, so a prefix query is a binary search
+    followed by a short forward scan: O(log n + k) for k suggestions,
+    regardless of how many other patients are hosted. Unowned
+    medications are kept under the `None` owner. The index is loaded
+    lazily from the database on first use and then maintained
+    incrementally by the Medication save/delete signal handlers.
+
+    Each process holds its own copy. Processes announce their changes
+    with `publish()`, which bumps a version number in the default cache.
+    `suggest()` compares it with the version its copy was loaded at,
+    at most once every `MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL`
+    seconds so that lookups do not wait on the cache server, and
+    reloads on a mismatch; changes made by other processes therefore
+    show up after up to that interval. This needs a cache shared by all
+    processes, and every change elsewhere costs each process a full
+    reload, so `MEDICATION_SUGGEST_BACKEND = "database"` is the better
+    choice for multi-process deployments with frequent edits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._by_id = {}
+        self._loaded = False
+        self._version = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.casefold()
+
+    def load(self, rows, version=None):
+        """
+        Replace the index contents.
+
+        Args:
+            rows (Iterable[tuple[int, str, int | None]]): `(id, name, owner_id)` triples.
+            version (int | None): The published version the rows were read
+                at; defaults to the current one.
+        """
+        if version is None:
+            version = cache.get(VERSION_KEY, 0)
+        entries = {}
+        by_id = {}
+        for pk, name, owner_id in rows:
+            entry = (self._key(name), pk, name)
+            entries.setdefault(owner_id, []).append(entry)
+            by_id[pk] = (owner_id, entry)
+        for owner_entries in entries.values():
+            owner_entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._by_id = by_id
+            self._loaded = True
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            now = time.monotonic()
+            if now - self._checked_at < settings.MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL:
+                return
+            self._checked_at = now
+            if cache.get(VERSION_KEY, 0) != self._version:
+                self.invalidate()
+        if not self._loaded:
+            from .models import Medication
+
+            # Read the version first: a change committed after it bumps
+            # the version again and triggers another reload.
+            version = cache.get(VERSION_KEY, 0)
+            self.load(Medication.objects.values_list("id", "name", "owner_id").iterator(), version)
+
+    def invalidate(self):
+        """Drop the index so that it is reloaded on next use."""
+        with self._lock:
+            self._entries = {}
+            self._by_id = {}
+            self._loaded = False
+
+    def publish(self):
+        """
+        Tell other processes that a medication was added, renamed or removed.
+
+        Call after applying the change locally with `add()` or
+        `remove()`. This copy stays valid if no other process published
+        a change since it was last brought up to date.
+        """
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 0, timeout=None)
+            version = cache.incr(VERSION_KEY)
+        with self._lock:
+            if self._loaded and version == self._version + 1:
+                self._version = version
+
+    def add(self, pk: int, name: str, owner_id=None):
+        """Insert or rename a medication. No-op until the index is loaded."""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._discard(pk)
+            entry = (self._key(name), pk, name)
+            insort(self._entries.setdefault(owner_id, []), entry)
+            self._by_id[pk] = (owner_id, entry)
+
+    def remove(self, pk: int):
+        """Remove a medication. No-op until the index is loaded."""
+        with self._lock:
+            if self._loaded:
+                self._discard(pk)
+
+    def _discard(self, pk):
+        owner_id, entry = self._by_id.pop(pk, (None, None))
+        if entry is not None:
+            owner_entries = self._entries[owner_id]
+            del owner_entries[bisect_left(owner_entries, entry)]
+
+    def suggest(self, prefix: str, limit: int = 10, owner_id=None):
+        """
+        Return an owner's medications whose name starts with `prefix`.
+
+        Matching is case-insensitive and results are ordered by name.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): Maximum number of suggestions.
+            owner_id (int | None): Owner whose medications are searched;
+                None searches unowned medications.
+
+        Returns:
+            list[dict]: Up to `limit` items with `id` and `name` keys.
+        """
+        self._ensure_loaded()
+        key = self._key(prefix)
+        entries = self._entries.get(owner_id, [])
+        suggestions = []
+        position = bisect_left(entries, (key,))
+        while position < len(entries) and len(suggestions) < limit:
+            entry_key, pk, name = entries[position]
+            if not entry_key.startswith(key):
+                break
+            suggestions.append({"id": pk, "name": name})
+            position += 1
+        return suggestions
+
+
+medication_names = MedicationNameIndex()
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "medtracker_dose_events"
+
+
+class Subscription:
+    """A single event-stream client waiting for dose events."""
+
+    __slots__ = ("owner_id", "medication_id", "queue", "loop", "dropped")
+
+    def __init__(self, owner_id, medication_id, loop, max_queue):
+        self.owner_id = owner_id
+        self.medication_id = medication_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, event) -> bool:
+        return self.medication_id is None or self.medication_id == event["log"]["medication"]
+
+    def deliver(self, event):
+        """Queue an event; runs on the subscriber's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client must not hold up everyone else.
+            self.dropped += 1
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class Broadcaster:
+    """
+    In-process fan-out of dose events to stream subscribers.
+
+    Subscribers are bucketed by owner, so publishing an event only
+    touches the connections of the patient it belongs to. `publish()`
+    is thread-safe and may be called from request threads, signal
+    handlers or the LISTEN thread; events are handed to each
+    subscriber's event loop with `call_soon_threadsafe`.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._by_owner = {}
+
+    def subscribe(self, owner_id, medication_id=None) -> Subscription:
+        """Register a subscriber; must be called from a running event loop."""
+        subscription = Subscription(
+            owner_id, medication_id, asyncio.get_running_loop(), self.max_queue
+        )
+        with self._lock:
+            self._by_owner.setdefault(owner_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            bucket = self._by_owner.get(subscription.owner_id)
+            if bucket is not None:
+                bucket.discard(subscription)
+                if not bucket:
+                    del self._by_owner[subscription.owner_id]
+
+    def has_subscribers(self, owner_id) -> bool:
+        return owner_id in self._by_owner
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(bucket) for bucket in self._by_owner.values())
+
+    def publish(self, event):
+        """Deliver `event` to every matching subscriber of its owner."""
+        with self._lock:
+            subscribers = tuple(self._by_owner.get(event["owner"], ()))
+        for subscription in subscribers:
+            if subscription.matches(event):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # The subscriber's loop has been closed.
+                    self.unsubscribe(subscription)
+
+
+class PostgresListener(threading.Thread):
+    """
+    Relays NOTIFY messages on `NOTIFY_CHANNEL` into a local broadcaster.
+
+    Each process runs one listener on a dedicated connection, so events
+    written by any process reach the subscribers of every process. A
+    failed connection is closed and replaced after `RETRY_DELAY` seconds.
+    """
+
+    RETRY_DELAY = 5
+
+    def __init__(self, broadcaster, alias="default"):
+        super().__init__(name="dose-event-listener", daemon=True)
+        self.broadcaster = broadcaster
+        self.alias = alias
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Ask the listener to exit; takes effect within 30 seconds."""
+        self._stopped.set()
+
+    def run(self):
+        wrapper = connections[self.alias]
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = wrapper.get_new_connection(wrapper.get_connection_params())
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.broadcaster.publish(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Dose event listener failed; reconnecting")
+            finally:
+                if conn is not None:
+                    conn.close()
+            self._stopped.wait(self.RETRY_DELAY)
+
+
+dose_events = Broadcaster(max_queue=settings.DOSE_EVENTS_QUEUE_SIZE)
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def ensure_listener():
+    """Start the LISTEN thread once per process when using the postgres backend."""
+    global _listener
+    if settings.DOSE_EVENTS_BACKEND != "postgres" or _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = PostgresListener(dose_events)
+            _listener.start()
+
+
+def wants_dose_events(owner_id) -> bool:
+    """Return False when no subscriber could possibly receive an event for `owner_id`."""
+    return settings.DOSE_EVENTS_BACKEND == "postgres" or dose_events.has_subscribers(owner_id)
+
+
+def publish_dose_event(kind, log_data, owner_id, using="default"):
+    """
+    Publish a dose log event to all stream subscribers once committed.
+
+    With the "postgres" backend the event is sent with `pg_notify`,
+    which PostgreSQL delivers to every listening process when the
+    surrounding transaction commits. With the default "local" backend
+    it is handed to the in-process broadcaster from `on_commit`.
+
+    Args:
+        kind (str): "created" or "updated".
+        log_data (dict): The serialized DoseLog.
+        owner_id (int | None): Owner of the dose log.
+        using (str): Database alias the log was written to.
+    """
+    event = {"type": kind, "owner": owner_id, "log": log_data}
+    if settings.DOSE_EVENTS_BACKEND == "postgres":
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(event)])
+    else:
+        transaction.on_commit(lambda: dose_events.publish(event), using=using)
+
+
+def format_sse(event) -> str:
+    """Encode an event as a Server-Sent Events message."""
+    return (
+        f"id: {event['log']['id']}\n"
+        f"event: {event['type']}\n"
+        f"data: {json.dumps(event['log'])}\n\n"
+    )
+
+
+async def event_stream(owner_id, medication_id, keepalive):
+    """
+    Subscribe to dose events and yield them as SSE messages.
+
+    The subscription is only registered once the response starts
+    streaming and is removed when the client goes away. A comment line
+    is sent every `keepalive` seconds so that proxies do not close idle
+    connections.
+    """
+    ensure_listener()
+    subscription = dose_events.subscribe(owner_id, medication_id)
+    try:
+        yield "retry: 3000\n: connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        dose_events.unsubscribe(subscription)
@@ -0,0 +1,206 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def job(name: str):
+    """
+    Register a function as a background job handler.
+
+    The handler is called as `handler(job, **job.payload)` by a worker
+    and its (JSON-serializable) return value is stored in `Job.result`.
+    A job whose worker is stopped or loses its lease is run again, so
+    handlers must be safe to re-run.
+
+    Example:
+        @job("warm_drug_info")
+        def warm_drug_info(job, medication_id):
+            ...
+    """
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name: str, owner=None, run_after=None, **payload) -> Job:
+    """
+    Queue a registered job for execution by a worker.
+
+    The job row is written in the caller's transaction, so it only
+    becomes visible to workers once that transaction commits.
+
+    Args:
+        name (str): Name the handler was registered under.
+        owner (User | None): User the job belongs to, if any.
+        run_after (datetime | None): Earliest time to run the job.
+        **payload: JSON-serializable keyword arguments for the handler.
+
+    Returns:
+        Job: The queued job.
+
+    Raises:
+        ValueError: If no handler is registered under `name`.
+    """
+    if name not in _registry:
+        raise ValueError(f"Unknown job: {name}")
+    return Job.objects.create(
+        name=name,
+        owner=owner,
+        payload=payload,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claim_job():
+    """
+    Claim the next runnable job, or return None if the queue is empty.
+
+    Runnable jobs are due queued jobs and running jobs whose lease has
+    expired, i.e. whose worker has not sent a heartbeat for
+    `JOB_LEASE_TIMEOUT` seconds. An expired job that has used up its
+    attempts is marked failed instead of being run again.
+
+    Rows locked by other workers are skipped rather than waited on. The
+    conditional status update makes claiming safe on backends without
+    row locks too (such as SQLite), where two workers may pick the same
+    row and only one of them wins the update.
+    """
+    while True:
+        now = timezone.now()
+        expired = now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT)
+        with transaction.atomic():
+            candidate = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Job.QUEUED, run_after__lte=now)
+                    | Q(status=Job.RUNNING, heartbeat_at__lt=expired)
+                )
+                .order_by("run_after", "id")
+                .first()
+            )
+            if candidate is None:
+                return None
+            unchanged = Job.objects.filter(
+                pk=candidate.pk, status=candidate.status, attempts=candidate.attempts
+            )
+            if candidate.status == Job.RUNNING:
+                logger.warning("Lease of job %s expired; reclaiming it", candidate)
+                if candidate.attempts >= candidate.max_attempts:
+                    unchanged.update(
+                        status=Job.FAILED,
+                        error="The worker running this job stopped responding.",
+                        finished_at=now,
+                    )
+                    continue
+            claimed = unchanged.update(
+                status=Job.RUNNING,
+                attempts=candidate.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+            )
+        if claimed:
+            candidate.status = Job.RUNNING
+            candidate.attempts += 1
+            candidate.started_at = candidate.heartbeat_at = now
+            return candidate
+
+
+def heartbeat(job: Job):
+    """
+    Renew the lease of a running job.
+
+    Handlers that may run longer than `JOB_LEASE_TIMEOUT` should call
+    this regularly (for example between batches) so that the job is not
+    reclaimed by another worker while it is still making progress.
+    """
+    job.heartbeat_at = timezone.now()
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(heartbeat_at=job.heartbeat_at)
+
+
+def release_jobs(job_ids) -> int:
+    """
+    Put running jobs back in the queue, for example on worker shutdown.
+
+    The interrupted attempt is not counted against `max_attempts`.
+
+    Args:
+        job_ids (Iterable[int]): Ids of the jobs to release.
+
+    Returns:
+        int: Number of jobs re-queued.
+    """
+    return Job.objects.filter(pk__in=list(job_ids), status=Job.RUNNING).update(
+        status=Job.QUEUED,
+        attempts=F("attempts") - 1,
+        run_after=timezone.now(),
+        heartbeat_at=None,
+    )
+
+
+def run_job(job: Job):
+    """
+    Execute a claimed job and record its outcome.
+
+    Failed jobs are re-queued with exponential backoff until
+    `max_attempts` is reached, after which they are marked failed. The
+    outcome is discarded if the job was reclaimed or released while it
+    ran, so that it cannot overwrite the state of a later attempt.
+    """
+    handler = _registry.get(job.name)
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job: {job.name}")
+        job.result = handler(job, **job.payload)
+        job.status = Job.SUCCEEDED
+        job.error = ""
+    except Exception:
+        logger.exception("Job %s failed", job)
+        job.error = traceback.format_exc()
+        if handler is not None and job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=2 ** job.attempts)
+        else:
+            job.status = Job.FAILED
+    job.finished_at = timezone.now()
+    recorded = Job.objects.filter(pk=job.pk, status=Job.RUNNING, attempts=job.attempts).update(
+        result=job.result,
+        status=job.status,
+        error=job.error,
+        run_after=job.run_after,
+        finished_at=job.finished_at,
+    )
+    if not recorded:
+        logger.warning("Job %s lost its lease; discarding its outcome", job)
+    return job
+
+
+def run_pending(limit=None) -> int:
+    """
+    Run queued jobs in the current thread until the queue is drained.
+
+    Args:
+        limit (int | None): Stop after this many jobs.
+
+    Returns:
+        int: Number of jobs executed.
+    """
+    count = 0
+    while limit is None or count < limit:
+        claimed = claim_job()
+        if claimed is None:
+            break
+        run_job(claimed)
+        count += 1
+    return count
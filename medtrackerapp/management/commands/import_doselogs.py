@@ -0,0 +1,222 @@
+import csv
+import io
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from medtrackerapp.models import (
+    DoseLog, Medication, _count_deltas, apply_adherence_deltas, reserve_change_seqs,
+)
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "taken"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "missed"}
+COPY_COLUMNS = ("owner", "medication", "taken_at", "was_taken", "updated_at", "change_seq")
+
+
+def parse_was_taken(value):
+    if value is None or value.strip() == "":
+        return True
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid was_taken value {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Import dose history from a CSV file with `medication`, `taken_at` and "
+        "optional `was_taken` columns. Medication names are resolved to ids "
+        "in memory. On PostgreSQL each chunk is loaded with COPY FROM STDIN; "
+        "other databases fall back to batched bulk_create. Each chunk is "
+        "committed separately along with its dose counter updates, so an "
+        "interrupted import leaves a prefix of the file loaded and counted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument(
+            "--owner",
+            help="Username whose medications the names refer to; "
+                 "unowned medications if omitted.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50_000,
+            help="Rows loaded per transaction.",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop the DoseLog secondary indexes during the load and "
+                 "rebuild them afterwards (PostgreSQL only). Only use this "
+                 "while the API is not serving traffic: queries lose the "
+                 "indexes and rebuilding locks the table.",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        owner = self._get_owner(options["owner"])
+        names = self._medication_names(owner)
+        chunk_size = max(1, options["chunk_size"])
+        use_copy = connection.vendor == "postgresql"
+        if options["defer_indexes"] and not use_copy:
+            self.stderr.write("--defer-indexes is only supported on PostgreSQL; ignoring it.")
+
+        loaded = 0
+        unknown = {}
+        started = time.monotonic()
+        defer = options["defer_indexes"] and use_copy
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as fp, self._deferred_indexes(defer):
+                reader = csv.DictReader(fp)
+                missing = {"medication", "taken_at"} - set(reader.fieldnames or ())
+                if missing:
+                    raise CommandError(f"Missing CSV column(s): {', '.join(sorted(missing))}")
+
+                chunk = []
+                for line, row in enumerate(reader, start=2):
+                    try:
+                        name = self._required(row, "medication")
+                        medication_id = names.get(name.strip().casefold())
+                        if medication_id is None:
+                            unknown[name] = unknown.get(name, 0) + 1
+                            continue
+                        chunk.append((medication_id, self._parse_time(self._required(row, "taken_at")),
+                                      parse_was_taken(row.get("was_taken"))))
+                    except ValueError as exc:
+                        raise CommandError(f"Line {line}: {exc}") from exc
+                    if len(chunk) >= chunk_size:
+                        loaded += self._load(chunk, owner, use_copy)
+                        self._progress(loaded, started)
+                        chunk = []
+                if chunk:
+                    loaded += self._load(chunk, owner, use_copy)
+        except OSError as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}") from exc
+
+        elapsed = time.monotonic() - started
+        rate = loaded / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {loaded} dose log(s) in {elapsed:.1f}s ({rate:,.0f} rows/s)"
+        ))
+        if unknown:
+            skipped = ", ".join(f"{name!r} ({count})" for name, count in sorted(unknown.items())[:10])
+            self.stderr.write(
+                f"Skipped {sum(unknown.values())} row(s) with unknown medications: {skipped}"
+            )
+
+    def _get_owner(self, username):
+        if username is None:
+            return None
+        User = get_user_model()
+        try:
+            return User.objects.get(**{User.USERNAME_FIELD: username})
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {username!r}")
+
+    @staticmethod
+    def _medication_names(owner):
+        names = {}
+        medications = Medication.objects.filter(owner=owner).order_by("pk").values_list("name", "pk")
+        for name, pk in medications.iterator():
+            names.setdefault(name.strip().casefold(), pk)
+        return names
+
+    @staticmethod
+    def _required(row, column):
+        # DictReader fills the cells missing from short rows with None.
+        value = row.get(column)
+        if value is None:
+            raise ValueError(f"missing {column} value")
+        return value
+
+    @staticmethod
+    def _parse_time(value):
+        taken_at = parse_datetime(value.strip())
+        if taken_at is None:
+            raise ValueError(f"invalid taken_at value {value!r}")
+        if timezone.is_naive(taken_at):
+            taken_at = timezone.make_aware(taken_at)
+        return taken_at
+
+    def _progress(self, loaded, started):
+        if self.verbosity >= 2:
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{loaded} rows ({loaded / elapsed:,.0f} rows/s)")
+
+    def _load(self, chunk, owner, use_copy):
+        owner_id = owner.pk if owner is not None else None
+        if not use_copy:
+            DoseLog.objects.bulk_create(
+                (
+                    DoseLog(owner_id=owner_id, medication_id=medication_id,
+                            taken_at=taken_at, was_taken=was_taken)
+                    for medication_id, taken_at, was_taken in chunk
+                ),
+                batch_size=1000,
+            )
+            return len(chunk)
+
+        with transaction.atomic():
+            seqs = reserve_change_seqs(len(chunk))
+            now = timezone.now().isoformat()
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for (medication_id, taken_at, was_taken), seq in zip(chunk, seqs):
+                writer.writerow([
+                    owner_id if owner_id is not None else "",
+                    medication_id,
+                    taken_at.isoformat(),
+                    "t" if was_taken else "f",
+                    now,
+                    seq,
+                ])
+            buffer.seek(0)
+            columns = ", ".join(
+                connection.ops.quote_name(DoseLog._meta.get_field(name).column)
+                for name in COPY_COLUMNS
+            )
+            sql = (
+                f"COPY {connection.ops.quote_name(DoseLog._meta.db_table)} ({columns}) "
+                f"FROM STDIN WITH (FORMAT csv)"
+            )
+            with connection.cursor() as cursor:
+                raw = cursor.cursor
+                if hasattr(raw, "copy_expert"):  # psycopg2
+                    raw.copy_expert(sql, buffer)
+                else:  # psycopg 3
+                    with raw.copy(sql) as copy:
+                        copy.write(buffer.getvalue())
+            # COPY bypasses DoseLogQuerySet.bulk_create(); count the chunk's
+            # rows in the same transaction.
+            apply_adherence_deltas(_count_deltas(
+                (medication_id, was_taken) for medication_id, _, was_taken in chunk
+            ))
+        return len(chunk)
+
+    @contextmanager
+    def _deferred_indexes(self, enabled):
+        """Drop DoseLog's Meta indexes for the duration of the block."""
+        if not enabled:
+            yield
+            return
+        indexes = DoseLog._meta.indexes
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(DoseLog, index)
+        try:
+            yield
+        finally:
+            started = time.monotonic()
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(DoseLog, index)
+            self.stdout.write(f"Rebuilt {len(indexes)} index(es) in {time.monotonic() - started:.1f}s")
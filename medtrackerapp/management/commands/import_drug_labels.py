@@ -0,0 +1,191 @@
+import io
+import json
+import time
+import zipfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from medtrackerapp.models import DrugLabel
+from medtrackerapp.services import DrugInfoService
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStream:
+    """Incremental reader over a text stream holding one large JSON document."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+
+def iter_results(stream, chunk_size=1 << 20):
+    """
+    Yield the records of an OpenFDA bulk file one at a time.
+
+    The file is a single JSON object whose `results` array holds every
+    label. It is read `chunk_size` characters at a time and each record
+    is decoded with `JSONDecoder.raw_decode` as soon as it is complete,
+    so memory use is bounded by the largest record, not the file.
+
+    Args:
+        stream (TextIO): The bulk JSON document.
+        chunk_size (int): Characters to read at a time.
+
+    Yields:
+        dict: One label record.
+
+    Raises:
+        ValueError: If the document is not a JSON object with a
+            `results` array.
+    """
+    reader = _JSONStream(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "results":
+            reader.expect("[")
+            if reader.peek() != "]":
+                while True:
+                    yield reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.pos += 1
+            reader.expect("]")
+        else:
+            reader.value()
+        if reader.peek() != ",":
+            break
+        reader.pos += 1
+    reader.expect("}")
+
+
+def label_from_record(record):
+    """Build an unsaved DrugLabel from a label record, or None if it has no generic name."""
+    generic_names = record.get("openfda", {}).get("generic_name")
+    if not generic_names or not record.get("id"):
+        return None
+    info = DrugInfoService.summarize(record)
+    return DrugLabel(
+        label_id=record["id"],
+        generic_name=info["name"].strip().lower()[:255],
+        name=info["name"][:255],
+        manufacturer=info["manufacturer"][:255],
+        warnings=info["warnings"],
+        purpose=info["purpose"],
+        effective_time=record.get("effective_time", "")[:8],
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Import an OpenFDA drug label bulk download (.json or .json.zip) "
+        "into the local DrugLabel mirror. The file is streamed, so the "
+        "full multi-gigabyte download can be loaded in constant memory. "
+        "Existing labels are updated in place."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="+", help="Bulk label files to import.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Labels written per INSERT statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        imported = skipped = 0
+        started = time.monotonic()
+        for path in options["path"]:
+            try:
+                with self._open(path) as stream:
+                    batch = []
+                    for record in iter_results(stream):
+                        label = label_from_record(record)
+                        if label is None:
+                            skipped += 1
+                            continue
+                        batch.append(label)
+                        if len(batch) >= batch_size:
+                            imported += self._write(batch)
+                            batch = []
+                    imported += self._write(batch)
+            except (OSError, ValueError, zipfile.BadZipFile) as exc:
+                raise CommandError(f"Could not import {path}: {exc}") from exc
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} label(s), skipped {skipped} without a generic name, "
+            f"in {elapsed:.1f}s"
+        ))
+
+    @staticmethod
+    def _open(path):
+        if not zipfile.is_zipfile(path):
+            return open(path, encoding="utf-8")
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist() if name.endswith(".json")]
+            if not members:
+                raise ValueError("the archive contains no .json file")
+            # The member keeps the underlying file open after the archive closes.
+            member = archive.open(members[0])
+        return io.TextIOWrapper(member, encoding="utf-8")
+
+    @staticmethod
+    def _write(batch):
+        # A bulk file may repeat a label; keep the last copy.
+        labels = list({label.label_id: label for label in batch}.values())
+        DrugLabel.objects.bulk_create(
+            labels,
+            update_conflicts=True,
+            unique_fields=["label_id"],
+            update_fields=[
+                "generic_name", "name", "manufacturer", "warnings", "purpose", "effective_time",
+            ],
+        )
+        return len(labels)
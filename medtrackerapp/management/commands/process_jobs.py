@@ -0,0 +1,116 @@
+import logging
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+
+from medtrackerapp.jobs import claim_job, release_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue. Each worker thread "
+        "claims jobs with SELECT ... FOR UPDATE SKIP LOCKED, so several "
+        "processes can be started side by side to scale out. On SIGTERM or "
+        "Ctrl-C, running jobs get a grace period to finish and are then "
+        "put back in the queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.JOB_WORKER_THREADS,
+            help="Number of worker threads (default: JOB_WORKER_THREADS).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is drained instead of polling forever.",
+        )
+        parser.add_argument(
+            "--grace-period",
+            type=float,
+            default=settings.JOB_SHUTDOWN_GRACE,
+            help="Seconds to wait for running jobs on shutdown before re-queueing them.",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        counts = []
+        running = {}
+
+        def work():
+            processed = 0
+            try:
+                while not stop.is_set():
+                    close_old_connections()
+                    try:
+                        job = claim_job()
+                    except DatabaseError:
+                        logger.exception("Could not claim a job; retrying")
+                        stop.wait(options["poll_interval"])
+                        continue
+                    if job is None:
+                        if options["once"]:
+                            break
+                        stop.wait(options["poll_interval"])
+                        continue
+                    running[threading.get_ident()] = job.pk
+                    try:
+                        run_job(job)
+                    finally:
+                        running.pop(threading.get_ident(), None)
+                    processed += 1
+            finally:
+                counts.append(processed)
+                connection.close()
+
+        threads = [
+            threading.Thread(target=work, name=f"job-worker-{i}", daemon=True)
+            for i in range(max(1, options["workers"]))
+        ]
+        self.stdout.write(f"Starting {len(threads)} job worker thread(s)")
+        started = time.monotonic()
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        try:
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    while thread.is_alive() and not stop.is_set():
+                        thread.join(0.5)
+            except KeyboardInterrupt:
+                stop.set()
+            if stop.is_set():
+                self._shut_down(threads, running, options["grace_period"])
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {sum(counts)} job(s) in {elapsed:.1f}s"
+        ))
+
+    def _shut_down(self, threads, running, grace_period):
+        self.stdout.write(f"Stopping; waiting up to {grace_period:g}s for running jobs...")
+        deadline = time.monotonic() + grace_period
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        # Worker threads are daemons, so jobs still running are abandoned
+        # when the process exits; queue them for another worker.
+        interrupted = list(running.values())
+        if interrupted:
+            released = release_jobs(interrupted)
+            self.stdout.write(f"Re-queued {released} unfinished job(s)")
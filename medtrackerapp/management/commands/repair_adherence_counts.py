@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from medtrackerapp.models import Medication
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every medication's taken_count and total_count from its "
+        "dose logs. Medications are processed in batches, each locked only "
+        "for the duration of its own short transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Medications recounted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        checked = corrected = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                Medication.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            corrected += Medication.objects.filter(pk__in=pks).refresh_adherence_counts()
+            checked += len(pks)
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} medication(s), corrected {corrected}"
+        ))
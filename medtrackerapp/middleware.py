@@ -0,0 +1,106 @@
+import re
+import secrets
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+_accept_encoding_re = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def accepted_encodings(header: str):
+    """Return the content codings allowed by an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(","):
+        match = _accept_encoding_re.match(item)
+        if not match:
+            continue
+        coding, quality = match.group(1).lower(), match.group(2)
+        try:
+            if quality is not None and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+def compress_brotli(data: bytes, *, quality: int, max_random_bytes=None):
+    """
+    Brotli-compress `data`, optionally with a random amount of padding.
+
+    Like `django.utils.text.compress_string` does for gzip, a random
+    number (below `max_random_bytes`) of ignored bytes is added to the
+    stream, so the compressed length no longer reveals how well secrets
+    in the body compress against attacker-controlled input (BREACH).
+    The padding is a metadata meta-block, which decoders skip; it is
+    written after the stream header, which `flush()` byte-aligns.
+    """
+    compressor = brotli.Compressor(quality=quality)
+    padding = secrets.randbelow(max_random_bytes) if max_random_bytes else 0
+    if not padding:
+        return compressor.process(data) + compressor.finish()
+    # ISLAST=0, MNIBBLES=0 (metadata), MSKIPBYTES=1, MSKIPLEN-1, then
+    # zero bits up to the byte boundary, then the skipped bytes.
+    metadata = (0b010110 | (padding - 1) << 6).to_bytes(2, "little") + b"\0" * padding
+    return (
+        compressor.process(b"") + compressor.flush() + metadata
+        + compressor.process(data) + compressor.finish()
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with Brotli or gzip, whichever the client accepts.
+
+    Brotli is preferred when the optional `brotli` package is installed.
+    Bodies smaller than `COMPRESSION_MIN_SIZE` bytes are left alone,
+    since the CPU spent on them buys little. Streaming responses (such as
+    the dose event stream) are never compressed, because buffering would
+    delay their events.
+
+    Both codings add the same random padding as Django's
+    `GZipMiddleware` to mitigate BREACH.
+    """
+
+    max_random_bytes = GZipMiddleware.max_random_bytes
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+            compressed = compress_brotli(
+                response.content,
+                quality=settings.COMPRESSION_BROTLI_QUALITY,
+                max_random_bytes=self.max_random_bytes,
+            )
+        elif "gzip" in accepted:
+            encoding = "gzip"
+            compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # The body changed, so a strong ETag no longer holds.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:23
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION medtrackerapp_note_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('english', coalesce(NEW.text, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER medtrackerapp_note_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF text ON medtrackerapp_note
+    FOR EACH ROW EXECUTE FUNCTION medtrackerapp_note_search_vector_update();
+
+UPDATE medtrackerapp_note SET search_vector = to_tsvector('english', coalesce(text, ''));
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS medtrackerapp_note_search_vector_trigger ON medtrackerapp_note;
+DROP FUNCTION IF EXISTS medtrackerapp_note_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0002_note'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='note_search_vector_gin'),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
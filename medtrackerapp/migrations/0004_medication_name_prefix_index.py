@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+# `name__istartswith` compiles to UPPER("name"::text) LIKE UPPER(%s) on
+# PostgreSQL; a pattern_ops index over the same expression lets the
+# planner answer it with an index range scan. UPPER() yields text, so
+# the text flavour of the operator class is the one that matches.
+CREATE_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS medication_name_upper_prefix
+    ON medtrackerapp_medication ((UPPER(name::text)) text_pattern_ops);
+"""
+
+DROP_INDEX_SQL = "DROP INDEX IF EXISTS medication_name_upper_prefix;"
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_INDEX_SQL)
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0003_note_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
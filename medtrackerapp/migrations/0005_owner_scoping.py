@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0004_medication_name_prefix_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doselog',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='doselog',
+            index=models.Index(fields=['owner', 'taken_at'], name='doselog_owner_taken_at'),
+        ),
+        migrations.AddIndex(
+            model_name='doselog',
+            index=models.Index(fields=['owner', 'medication', 'taken_at'], name='doselog_owner_med_taken_at'),
+        ),
+        migrations.AddIndex(
+            model_name='medication',
+            index=models.Index(fields=['owner', 'name'], name='medication_owner_name'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['owner', 'created_at'], name='note_owner_created_at'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['owner', 'medication', 'created_at'], name='note_owner_med_created_at'),
+        ),
+    ]
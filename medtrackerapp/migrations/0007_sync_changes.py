@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+SYNCED_TABLES = ["medtrackerapp_medication", "medtrackerapp_doselog", "medtrackerapp_note"]
+
+
+def create_change_sequence(apps, schema_editor):
+    """Create the change sequence and number existing rows from it."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE SEQUENCE IF NOT EXISTS medtrackerapp_change_seq;")
+        for table in SYNCED_TABLES:
+            schema_editor.execute(
+                f"UPDATE {table} SET change_seq = nextval('medtrackerapp_change_seq');"
+            )
+        return
+
+    using = schema_editor.connection.alias
+    value = 0
+    for model_name in ["Medication", "DoseLog", "Note"]:
+        model = apps.get_model("medtrackerapp", model_name)
+        for pk in model.objects.using(using).order_by("pk").values_list("pk", flat=True):
+            value += 1
+            model.objects.using(using).filter(pk=pk).update(change_seq=value)
+    apps.get_model("medtrackerapp", "SyncCounter").objects.using(using).create(pk=1, value=value)
+
+
+def drop_change_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP SEQUENCE IF EXISTS medtrackerapp_change_seq;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0006_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('medication', 'Medication'), ('doselog', 'Dose log'), ('note', 'Note')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='doselog',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doselog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='doselog',
+            index=models.Index(fields=['owner', 'change_seq'], name='doselog_owner_change_seq'),
+        ),
+        migrations.AddIndex(
+            model_name='medication',
+            index=models.Index(fields=['owner', 'change_seq'], name='medication_owner_change_seq'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['owner', 'change_seq'], name='note_owner_change_seq'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['owner', 'change_seq'], name='tombstone_owner_change_seq'),
+        ),
+        migrations.RunPython(create_change_sequence, drop_change_sequence),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0007_sync_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugLabel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label_id', models.CharField(max_length=64, unique=True)),
+                ('generic_name', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=255)),
+                ('manufacturer', models.CharField(max_length=255)),
+                ('warnings', models.JSONField(default=list)),
+                ('purpose', models.JSONField(default=list)),
+                ('effective_time', models.CharField(blank=True, max_length=8)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['generic_name', '-effective_time'], name='druglabel_generic_name')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:46
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Medication = apps.get_model("medtrackerapp", "Medication")
+    DoseLog = apps.get_model("medtrackerapp", "DoseLog")
+    logs = DoseLog.objects.filter(medication=models.OuterRef("pk")).order_by().values("medication")
+    Medication.objects.using(schema_editor.connection.alias).update(
+        total_count=Coalesce(
+            models.Subquery(logs.annotate(n=models.Count("pk")).values("n")), 0
+        ),
+        taken_count=Coalesce(
+            models.Subquery(logs.filter(was_taken=True).annotate(n=models.Count("pk")).values("n")), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0008_druglabel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medication',
+            name='taken_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='total_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
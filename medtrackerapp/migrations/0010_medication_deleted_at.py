@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0009_adherence_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medication',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:02
+
+from django.db import migrations
+
+
+# Transactions that allocate change sequence values hold a shared,
+# transaction-scoped advisory lock keyed on the first value they
+# allocated. The (21586, 1) lock is a gate that makes "allocate a value
+# and take its lock" atomic with respect to reading the safe point.
+CREATE_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION medtrackerapp_reserve_change_seqs(n integer) RETURNS SETOF bigint AS $$
+DECLARE
+    first_value bigint;
+BEGIN
+    IF n > 0 AND coalesce(current_setting('medtrackerapp.change_seq_held', true), '') = '' THEN
+        PERFORM pg_advisory_lock_shared(21586, 1);
+        first_value := nextval('medtrackerapp_change_seq');
+        PERFORM pg_advisory_xact_lock_shared(first_value);
+        PERFORM pg_advisory_unlock_shared(21586, 1);
+        PERFORM set_config('medtrackerapp.change_seq_held', first_value::text, true);
+        RETURN NEXT first_value;
+        n := n - 1;
+    END IF;
+    RETURN QUERY SELECT nextval('medtrackerapp_change_seq') FROM generate_series(1, n);
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION medtrackerapp_safe_change_seq() RETURNS bigint AS $$
+DECLARE
+    allocated bigint;
+    held bigint;
+BEGIN
+    PERFORM pg_advisory_lock(21586, 1);
+    BEGIN
+        SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END
+            INTO allocated FROM medtrackerapp_change_seq;
+        SELECT min((classid::bigint << 32) | objid::bigint) INTO held
+            FROM pg_locks
+            WHERE locktype = 'advisory' AND objsubid = 1
+              AND database = (SELECT oid FROM pg_database WHERE datname = current_database());
+    EXCEPTION WHEN OTHERS THEN
+        PERFORM pg_advisory_unlock(21586, 1);
+        RAISE;
+    END;
+    PERFORM pg_advisory_unlock(21586, 1);
+    RETURN coalesce(held - 1, allocated);
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTIONS_SQL = """
+DROP FUNCTION IF EXISTS medtrackerapp_reserve_change_seqs(integer);
+DROP FUNCTION IF EXISTS medtrackerapp_safe_change_seq();
+"""
+
+
+def create_functions(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_FUNCTIONS_SQL)
+
+
+def drop_functions(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_FUNCTIONS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0010_medication_deleted_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_functions, drop_functions),
+    ]
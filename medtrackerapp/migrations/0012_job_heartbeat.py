@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_heartbeats(apps, schema_editor):
+    """Let jobs left running by crashed workers be reclaimed."""
+    Job = apps.get_model("medtrackerapp", "Job")
+    Job.objects.using(schema_editor.connection.alias).filter(
+        status="running", heartbeat_at__isnull=True
+    ).update(heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medtrackerapp', '0011_change_seq_safe_point'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'running')), fields=['heartbeat_at'], name='job_running_heartbeat_at'),
+        ),
+        migrations.RunPython(backfill_heartbeats, migrations.RunPython.noop),
+    ]
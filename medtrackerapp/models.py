@@ -1,40 +1,425 @@
-from django.db import models
-from datetime import date as _date
+from django.conf import settings
+from django.db import models, connections, router, transaction
+from datetime import date as _date, datetime as _datetime, time as _time, timedelta, timezone as _dt_timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
 from django.utils import timezone
 from .services import DrugInfoService
 
 
-class Medication(models.Model):
+NOTE_SEARCH_CONFIG = "english"
+
+
+def day_range(start_date: _date, end_date: _date):
+    """
+    Convert an inclusive date range into a half-open datetime range.
+
+    Filtering with `taken_at__gte=lower, taken_at__lt=upper` selects the
+    same rows as `taken_at__date__gte/lte`, but compares the raw column
+    so the database can use an index on it.
+
+    Args:
+        start_date (date): First day of the range.
+        end_date (date): Last day of the range (inclusive).
+
+    Returns:
+        tuple[datetime, datetime]: Aware datetimes in the current time zone.
+        Bounds that cannot be represented in UTC (around `date.min` and
+        `date.max`) are clamped to `datetime.min` / `datetime.max` in UTC.
+    """
+    lower = _start_of_day(start_date)
+    if end_date >= _date.max:
+        upper = _datetime.max.replace(tzinfo=_dt_timezone.utc)
+    else:
+        upper = _start_of_day(end_date + timedelta(days=1))
+    return lower, upper
+
+
+def _start_of_day(day: _date):
+    """Return aware midnight of `day`, clamped to the range of UTC datetimes."""
+    start = timezone.make_aware(_datetime.combine(day, _time.min))
+    try:
+        start.astimezone(_dt_timezone.utc)
+    except OverflowError:
+        extreme = _datetime.max if day.year == _date.max.year else _datetime.min
+        return extreme.replace(tzinfo=_dt_timezone.utc)
+    return start
+
+
+class OwnedQuerySet(models.QuerySet):
+    """Queryset for models partitioned by owning user (tenant)."""
+
+    def for_owner(self, user):
+        """
+        Restrict rows to those belonging to `user`.
+
+        Anonymous users (or None) are scoped to rows without an owner,
+        which is the shared namespace used before per-user ownership
+        was introduced.
+
+        Args:
+            user (User | AnonymousUser | None): The requesting user.
+
+        Returns:
+            QuerySet: The scoped queryset.
+        """
+        if user is None or not user.is_authenticated:
+            return self.filter(owner__isnull=True)
+        return self.filter(owner=user)
+
+
+CHANGE_SEQUENCE = "medtrackerapp_change_seq"
+
+
+class SyncCounter(models.Model):
+    """
+    Fallback change-sequence counter for databases without sequences.
+
+    PostgreSQL uses the `medtrackerapp_change_seq` sequence instead.
+    """
+    value = models.BigIntegerField(default=0)
+
+
+def reserve_change_seqs(count: int, using="default"):
+    """
+    Allocate `count` values of the global change sequence.
+
+    Values are unique and increasing across Medication, DoseLog and Note
+    (and their tombstones), so a sync client can ask for "everything
+    after value N". Call this inside the transaction that writes the
+    values: until it ends, `safe_change_seq()` stays below them.
+
+    Args:
+        count (int): Number of values to allocate.
+        using (str): Database alias.
+
+    Returns:
+        list[int]: The allocated values in increasing order.
+    """
+    if count <= 0:
+        return []
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        # See migration 0011: the first value a transaction allocates is
+        # covered by an advisory lock until the transaction ends.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT medtrackerapp_reserve_change_seqs(%s)", [count])
+            return sorted(row[0] for row in cursor.fetchall())
+
+    # The counter row stays locked until the caller's transaction ends,
+    # so values are committed in the order they were allocated.
+    with transaction.atomic(using=using):
+        counter = SyncCounter.objects.using(using)
+        if not counter.filter(pk=1).update(value=models.F("value") + count):
+            counter.get_or_create(pk=1)
+            counter.filter(pk=1).update(value=models.F("value") + count)
+        end = counter.values_list("value", flat=True).get(pk=1)
+    return list(range(end - count + 1, end + 1))
+
+
+def next_change_seq(using="default") -> int:
+    """Allocate a single value of the global change sequence."""
+    return reserve_change_seqs(1, using)[0]
+
+
+def safe_change_seq(using="default"):
+    """
+    Return the highest change sequence value a sync may advance to.
+
+    Values are allocated before the writing transaction commits, so a
+    slow transaction can commit a value lower than one already visible.
+    On PostgreSQL this returns one less than the lowest value still held
+    by an open transaction (or the last allocated value if there is
+    none); every change up to it is committed or rolled back.
+
+    Args:
+        using (str): Database alias.
+
+    Returns:
+        int | None: The safe point, or None on other databases, where
+        allocation and commit are serialized by the counter row lock.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT medtrackerapp_safe_change_seq()")
+        return cursor.fetchone()[0]
+
+
+class ChangeTrackedQuerySet(OwnedQuerySet):
+    """Owned queryset whose `bulk_create` also stamps change sequence values."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            for obj, seq in zip(objs, reserve_change_seqs(len(objs), self.db)):
+                obj.change_seq = seq
+            return super().bulk_create(objs, *args, **kwargs)
+
+
+class ChangeTrackedModel(models.Model):
+    """
+    Abstract base for rows that offline clients synchronize.
+
+    Every save stamps `updated_at` and a fresh value of the global
+    change sequence, which `GET /api/sync/` uses to return only rows
+    changed since a client's last sync. Deletions are recorded as
+    `Tombstone` rows. `QuerySet.update()` bypasses `save()`, so such
+    changes are only tracked where the queryset stamps them itself (as
+    DoseLog's does, and as the Medication counter updates do).
+
+    The value is allocated in the same transaction as the write, which
+    lets `safe_change_seq()` tell when all lower values have committed.
+    """
+    updated_at = models.DateTimeField(auto_now=True)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Stamp a new change sequence value before saving."""
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "change_seq", "updated_at"}
+        with transaction.atomic(using=using, savepoint=False):
+            self.change_seq = next_change_seq(using)
+            super().save(*args, **kwargs)
+
+
+class Tombstone(models.Model):
+    """
+    Records the deletion of a synchronized row.
+
+    Lets `GET /api/sync/` report deletions to clients that synced before
+    the row was removed. Logs and notes removed together with their
+    medication get no tombstone of their own; clients drop them along
+    with the medication.
+    """
+
+    MEDICATION = "medication"
+    DOSELOG = "doselog"
+    NOTE = "note"
+    KIND_CHOICES = [(MEDICATION, "Medication"), (DOSELOG, "Dose log"), (NOTE, "Note")]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, db_index=False
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    class Meta:
+        """Metadata options for the Tombstone model."""
+        indexes = [
+            models.Index(fields=["owner", "change_seq"], name="tombstone_owner_change_seq"),
+        ]
+
+
+ADHERENCE_COUNTERS = ("taken_count", "total_count")
+
+
+def apply_adherence_deltas(deltas, using="default"):
+    """
+    Adjust medications' dose counters atomically with `F()` expressions.
+
+    Rows are updated in id order, so concurrent callers lock them in
+    the same order and cannot deadlock each other. The counters feed
+    the synced `adherence`, so each changed medication also gets a new
+    change sequence value and `updated_at` in the same UPDATE.
+
+    Args:
+        deltas (dict[int, tuple[int, int]]): `(total, taken)` changes
+            keyed by medication id.
+        using (str): Database alias.
+    """
+    changed = sorted(pk for pk, (total, taken) in deltas.items() if total or taken)
+    if not changed:
+        return
+    now = timezone.now()
+    with transaction.atomic(using=using, savepoint=False):
+        for medication_id, seq in zip(changed, reserve_change_seqs(len(changed), using)):
+            total, taken = deltas[medication_id]
+            Medication.objects.using(using).filter(pk=medication_id).update(
+                total_count=models.F("total_count") + total,
+                taken_count=models.F("taken_count") + taken,
+                change_seq=seq,
+                updated_at=now,
+            )
+
+
+def _count_deltas(rows, sign=1):
+    """Sum `(medication_id, was_taken)` rows into `apply_adherence_deltas()` input."""
+    deltas = {}
+    for medication_id, was_taken in rows:
+        total, taken = deltas.get(medication_id, (0, 0))
+        deltas[medication_id] = (total + sign, taken + sign * bool(was_taken))
+    return deltas
+
+
+def _merge_deltas(*all_deltas):
+    merged = {}
+    for deltas in all_deltas:
+        for medication_id, (total, taken) in deltas.items():
+            old_total, old_taken = merged.get(medication_id, (0, 0))
+            merged[medication_id] = (old_total + total, old_taken + taken)
+    return merged
+
+
+class MedicationQuerySet(ChangeTrackedQuerySet):
+    """Custom queryset for Medication."""
+
+    def refresh_adherence_counts(self) -> int:
+        """
+        Recompute `taken_count` and `total_count` from the dose logs.
+
+        The medications are locked first, so dose logs written
+        concurrently are either fully counted or wait until the
+        recount has committed.
+
+        Returns:
+            int: Number of medications whose counters were wrong.
+        """
+        with transaction.atomic(using=self.db):
+            current = list(
+                self.select_for_update().order_by("pk").values_list("pk", "total_count", "taken_count")
+            )
+            actual = {
+                medication_id: (total, taken)
+                for medication_id, total, taken in DoseLog._base_manager.using(self.db)
+                .filter(medication_id__in=[row[0] for row in current])
+                .order_by()
+                .values("medication_id")
+                .annotate(
+                    total=models.Count("pk"),
+                    taken=models.Count("pk", filter=models.Q(was_taken=True)),
+                )
+                .values_list("medication_id", "total", "taken")
+            }
+            wrong = [
+                (pk, actual.get(pk, (0, 0))) for pk, total, taken in current
+                if (total, taken) != actual.get(pk, (0, 0))
+            ]
+            now = timezone.now()
+            seqs = reserve_change_seqs(len(wrong), self.db)
+            for (pk, (actual_total, actual_taken)), seq in zip(wrong, seqs):
+                Medication._base_manager.using(self.db).filter(pk=pk).update(
+                    total_count=actual_total,
+                    taken_count=actual_taken,
+                    change_seq=seq,
+                    updated_at=now,
+                )
+        return len(wrong)
+
+
+class MedicationManager(models.Manager.from_queryset(MedicationQuerySet)):
+    """Default Medication manager; hides soft-deleted medications."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Medication(ChangeTrackedModel):
     """
     Represents a prescribed medication with dosage and daily schedule.
 
     Each Medication instance can have multiple associated DoseLog
-    entries that record when doses were taken or missed.
+    entries that record when doses were taken or missed. `total_count`
+    and `taken_count` are lifetime counts of those logs, kept up to date
+    by DoseLog and its queryset so that `adherence_rate()` needs no
+    query; `manage.py repair_adherence_counts` recomputes them.
+
+    Medications with a large history are deleted in two steps:
+    `soft_delete()` hides the medication at once, and the
+    `purge_medication` background job then removes its logs and notes
+    in small batches before deleting the row itself. `objects` excludes
+    soft-deleted medications; `all_objects` includes them.
     """
         
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, db_index=False
+    )
     name = models.CharField(max_length=100)
     dosage_mg = models.PositiveIntegerField()
     prescribed_per_day = models.PositiveIntegerField(help_text="Expected number of doses per day")
+    total_count = models.PositiveIntegerField(default=0, editable=False)
+    taken_count = models.PositiveIntegerField(default=0, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = MedicationManager()
+    all_objects = MedicationQuerySet.as_manager()
+
+    class Meta:
+        """Metadata options for the Medication model."""
+        indexes = [
+            models.Index(fields=["owner", "name"], name="medication_owner_name"),
+            models.Index(fields=["owner", "change_seq"], name="medication_owner_change_seq"),
+        ]
 
     def __str__(self):
         """Return a human-readable representation of the medication."""
         return f"{self.name} ({self.dosage_mg}mg)"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the medication without writing its dose counters or `deleted_at`.
+
+        Updates leave `total_count`, `taken_count` and `deleted_at`
+        alone, so saving a medication loaded earlier cannot overwrite
+        increments made by dose logs in the meantime, or bring back a
+        medication deleted in the meantime. `soft_delete()` writes
+        `deleted_at` explicitly through `update_fields`.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in ADHERENCE_COUNTERS
+                and field.name != "deleted_at"
+            ]
+        super().save(*args, **kwargs)
+
+    def soft_delete(self, using=None):
+        """
+        Mark the medication as deleted without touching its history.
+
+        This only updates one row, so it is fast regardless of how many
+        dose logs and notes the medication has. A tombstone is recorded
+        for sync clients. The caller is responsible for queueing the
+        `purge_medication` job that removes the data for good.
+        """
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self.deleted_at = timezone.now()
+            self.save(using=using, update_fields=["deleted_at"])
+            Tombstone.objects.using(using).create(
+                owner_id=self.owner_id,
+                kind=Tombstone.MEDICATION,
+                object_id=self.pk,
+                change_seq=next_change_seq(using),
+            )
+
     def adherence_rate(self):
         """
         Calculate the overall adherence rate for this medication.
 
         The adherence rate is the percentage of all recorded doses that
-        were marked as taken. Rounded to two decimals.
+        were marked as taken. Rounded to two decimals. It is read from
+        the `taken_count` and `total_count` counters, without a query.
 
         Returns:
             float: Adherence percentage between 0.0 and 100.0.
         """
-        logs = self.doselog_set.all()
-        if not logs.exists():
+        if not self.total_count:
             return 0.0
-        taken = logs.filter(was_taken=True).count()
-        return round((taken / logs.count()) * 100, 2)
+        return round((self.taken_count / self.total_count) * 100, 2)
 
     def expected_doses(self, days: int) -> int:
         """
@@ -75,10 +460,8 @@ class Medication(models.Model):
         if start_date > end_date:
             raise ValueError("start_date must be before or equal to end_date")
 
-        logs = self.doselog_set.filter(
-            taken_at__date__gte=start_date,
-            taken_at__date__lte=end_date
-        )
+        lower, upper = day_range(start_date, end_date)
+        logs = self.doselog_set.filter(taken_at__gte=lower, taken_at__lt=upper)
         days = (end_date - start_date).days + 1
         expected = self.expected_doses(days)
 
@@ -95,32 +478,179 @@ class Medication(models.Model):
 
         Uses the `DrugInfoService` to query OpenFDA for details
         about this medication's active ingredient or related data.
+        Successful lookups are cached (see `get_cached_drug_info`).
 
         Returns:
             dict: Drug information data, or {'error': message} if the
                   request fails or the API is unavailable.
         """
         try:
-            return DrugInfoService.get_drug_info(self.name)
+            return DrugInfoService.get_cached_drug_info(self.name)
         except Exception as exc:
             return {"error": str(exc)}
 
 
-class DoseLog(models.Model):
+class DoseLogQuerySet(ChangeTrackedQuerySet):
+    """
+    Custom queryset for DoseLog that keeps medication counters in step.
+
+    `bulk_create()`, `update()` and `delete()` adjust the affected
+    medications' `total_count` and `taken_count` in the same transaction.
+    `update()` and `delete()` lock the matching rows first and then only
+    touch those rows, so the adjustments are exact under concurrency.
+    `update()` also stamps each row with a new change sequence value,
+    so that sync clients receive the change.
+    """
+
+    COUNTED_FIELDS = {"was_taken", "medication", "medication_id"}
+    BATCH_SIZE = 500
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Which rows were actually inserted is unknown; recount.
+                medication_ids = {obj.medication_id for obj in created}
+                Medication.objects.using(self.db).filter(pk__in=medication_ids).refresh_adherence_counts()
+            else:
+                apply_adherence_deltas(
+                    _count_deltas((obj.medication_id, obj.was_taken) for obj in created), self.db
+                )
+        return created
+
+    def _locked_rows(self):
+        return list(
+            self.select_for_update().order_by("pk").values_list("pk", "medication_id", "was_taken")
+        )
+
+    def _batches(self, rows):
+        base = DoseLog._base_manager.using(self.db)
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            pks = [row[0] for row in rows[start:start + self.BATCH_SIZE]]
+            yield pks, base.filter(pk__in=pks)
+
+    def update(self, **kwargs):
+        counted = bool(self.COUNTED_FIELDS & kwargs.keys())
+        values = {"updated_at": timezone.now(), **kwargs}
+        with transaction.atomic(using=self.db):
+            rows = self._locked_rows()
+            updated = 0
+            after = []
+            for pks, batch in self._batches(rows):
+                seqs = reserve_change_seqs(len(pks), self.db)
+                updated += batch.update(
+                    **values,
+                    change_seq=models.Case(
+                        *(models.When(pk=pk, then=seq) for pk, seq in zip(pks, seqs)),
+                        output_field=models.BigIntegerField(),
+                    ),
+                )
+                if counted:
+                    after.extend(batch.values_list("medication_id", "was_taken"))
+            if counted:
+                apply_adherence_deltas(_merge_deltas(
+                    _count_deltas((row[1:] for row in rows), sign=-1), _count_deltas(after)
+                ), self.db)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            rows = self._locked_rows()
+            deleted, per_model = 0, {}
+            for _, batch in self._batches(rows):
+                count, counts = batch.delete()
+                deleted += count
+                for label, n in counts.items():
+                    per_model[label] = per_model.get(label, 0) + n
+            apply_adherence_deltas(_count_deltas((row[1:] for row in rows), sign=-1), self.db)
+        return deleted, per_model
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class DoseLog(ChangeTrackedModel):
     """
     Records the administration of a medication dose.
 
     Each DoseLog entry corresponds to a specific date/time when the
-    medication was either taken or missed.
+    medication was either taken or missed. `owner` is denormalized from
+    the medication so that per-patient queries can lead with it.
     """
         
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, db_index=False
+    )
     medication = models.ForeignKey(Medication, on_delete=models.CASCADE)
     taken_at = models.DateTimeField()
     was_taken = models.BooleanField(default=True)
 
+    objects = DoseLogQuerySet.as_manager()
+
     class Meta:
         """Metadata options for the DoseLog model."""
         ordering = ["-taken_at"]
+        indexes = [
+            models.Index(fields=["owner", "taken_at"], name="doselog_owner_taken_at"),
+            models.Index(
+                fields=["owner", "medication", "taken_at"], name="doselog_owner_med_taken_at"
+            ),
+            models.Index(fields=["owner", "change_seq"], name="doselog_owner_change_seq"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the log and update its medication's dose counters.
+
+        The owner is inherited from the medication on creation. When a
+        log is created, toggled or moved to another medication, the
+        counters are adjusted with `F()` expressions in the same
+        transaction; the stored row is locked and re-read first, so
+        concurrent edits of the same log are counted exactly once.
+        """
+        if self._state.adding and self.owner_id is None:
+            self.owner_id = self.medication.owner_id
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not DoseLogQuerySet.COUNTED_FIELDS & set(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic(using=using, savepoint=False):
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    DoseLog._base_manager.using(using).select_for_update()
+                    .filter(pk=self.pk).values_list("medication_id", "was_taken").first()
+                )
+            super().save(*args, **kwargs)
+            deltas = _merge_deltas(
+                _count_deltas([previous] if previous else [], sign=-1),
+                _count_deltas([(self.medication_id, self.was_taken)]),
+            )
+            apply_adherence_deltas(deltas, using)
+
+        if DoseLog.medication.is_cached(self):
+            # Keep the caller's medication instance in step with the database.
+            total, taken = deltas.get(self.medication_id, (0, 0))
+            self.medication.total_count += total
+            self.medication.taken_count += taken
+
+    def delete(self, *args, **kwargs):
+        """Delete the log and decrement its medication's dose counters."""
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            stored = (
+                DoseLog._base_manager.using(using).select_for_update()
+                .filter(pk=self.pk).values_list("medication_id", "was_taken").first()
+            )
+            result = super().delete(*args, **kwargs)
+            if stored is not None:
+                apply_adherence_deltas(_count_deltas([stored], sign=-1), using)
+        return result
 
     def __str__(self):
         """Return a human-readable description of the dose event."""
@@ -129,22 +659,200 @@ class DoseLog(models.Model):
         return f"{self.medication.name} at {when} - {status}"
 
 
-class Note(models.Model):
+class NoteQuerySet(ChangeTrackedQuerySet):
+    """Custom queryset for Note with full-text search support."""
+
+    def search(self, query: str):
+        """
+        Filter notes matching a free-text query.
+
+        On PostgreSQL the stored `search_vector` column (maintained by a
+        database trigger and backed by a GIN index) is matched with a
+        websearch-style `SearchQuery`, and results are ordered by
+        `SearchRank`. Other backends fall back to a case-insensitive
+        substring match on every term, ordered by recency.
+
+        Args:
+            query (str): The user-supplied search text.
+
+        Returns:
+            QuerySet: Matching notes, best matches first.
+        """
+        if connections[self.db].vendor == "postgresql":
+            search_query = SearchQuery(query, config=NOTE_SEARCH_CONFIG, search_type="websearch")
+            return (
+                self.filter(search_vector=search_query)
+                .annotate(rank=SearchRank(models.F("search_vector"), search_query))
+                .order_by("-rank", "-created_at")
+            )
+
+        notes = self
+        for term in query.split():
+            notes = notes.filter(text__icontains=term)
+        return notes.order_by("-created_at")
+
+
+class Note(ChangeTrackedModel):
     """
     Stores a note associated with a medication.
 
     Each Note contains text and is linked to a specific Medication.
     The created_at timestamp is automatically set when the note is created.
+    On PostgreSQL, `search_vector` holds the `tsvector` of the text and is
+    kept in sync by a trigger installed in migration 0003. `owner` is
+    denormalized from the medication, as on DoseLog.
     """
     
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, db_index=False
+    )
     medication = models.ForeignKey(Medication, on_delete=models.CASCADE)
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = NoteQuerySet.as_manager()
 
     class Meta:
         """Metadata options for the Note model."""
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="note_search_vector_gin"),
+            models.Index(fields=["owner", "created_at"], name="note_owner_created_at"),
+            models.Index(
+                fields=["owner", "medication", "created_at"], name="note_owner_med_created_at"
+            ),
+            models.Index(fields=["owner", "change_seq"], name="note_owner_change_seq"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save the note, inheriting the owner from its medication on creation."""
+        if self._state.adding and self.owner_id is None:
+            self.owner_id = self.medication.owner_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return a human-readable description of the note."""
         return f"Note for {self.medication.name}: {self.text}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work stored in the database.
+
+    Jobs are created with `medtrackerapp.jobs.enqueue()` and executed by
+    the `process_jobs` management command. Workers claim queued jobs with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of worker threads
+    and processes can share the table without blocking each other.
+
+    A claimed job holds a lease that its worker renews through
+    `heartbeat_at`. If the worker dies, the lease runs out after
+    `JOB_LEASE_TIMEOUT` seconds and another worker reclaims the job.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE
+    )
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    class Meta:
+        """Metadata options for the Job model."""
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queued_run_after",
+            ),
+            models.Index(
+                fields=["heartbeat_at"],
+                condition=models.Q(status="running"),
+                name="job_running_heartbeat_at",
+            ),
+        ]
+
+    def __str__(self):
+        """Return a human-readable description of the job."""
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class DrugLabelQuerySet(models.QuerySet):
+    """Custom queryset for DrugLabel lookups."""
+
+    def lookup(self, drug_name: str):
+        """
+        Return the most recent label for a generic name, or None.
+
+        Args:
+            drug_name (str): The generic name, in any case.
+
+        Returns:
+            DrugLabel | None: The matching label with the latest effective time.
+        """
+        return self.filter(generic_name=drug_name.strip().lower()).order_by("-effective_time").first()
+
+
+class DrugLabel(models.Model):
+    """
+    Local mirror of an OpenFDA drug label.
+
+    Rows are loaded from the OpenFDA bulk download with the
+    `import_drug_labels` management command, so that drug information
+    can be looked up without calling `api.fda.gov`. `generic_name` is
+    stored lowercased and indexed for exact-match lookups.
+    """
+
+    label_id = models.CharField(max_length=64, unique=True)
+    generic_name = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+    manufacturer = models.CharField(max_length=255)
+    warnings = models.JSONField(default=list)
+    purpose = models.JSONField(default=list)
+    effective_time = models.CharField(max_length=8, blank=True)
+
+    objects = DrugLabelQuerySet.as_manager()
+
+    class Meta:
+        """Metadata options for the DrugLabel model."""
+        indexes = [
+            models.Index(
+                fields=["generic_name", "-effective_time"], name="druglabel_generic_name"
+            ),
+        ]
+
+    def info(self) -> dict:
+        """Return the label in the format of `DrugInfoService.get_drug_info()`."""
+        return {
+            "name": self.name,
+            "manufacturer": self.manufacturer,
+            "warnings": self.warnings,
+            "purpose": self.purpose,
+        }
+
+    def __str__(self):
+        """Return a human-readable description of the label."""
+        return f"{self.name} ({self.manufacturer})"
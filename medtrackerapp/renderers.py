@@ -0,0 +1,74 @@
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_json_encoder = JSONEncoder()
+
+
+def _msgpack_default(obj):
+    # Reuse DRF's conversions for dates, decimals, UUIDs and the like.
+    return _json_encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders responses as MessagePack.
+
+    Selected with `Accept: application/msgpack` or `?format=msgpack`.
+    Typically 20-30% smaller than JSON and cheaper to encode and decode.
+    """
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parses MessagePack request bodies (`Content-Type: application/msgpack`)."""
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except Exception as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+def to_columns(rows):
+    """
+    Convert a list of objects into a column-oriented mapping.
+
+    Example:
+        >>> to_columns([{"id": 1, "was_taken": True}, {"id": 2, "was_taken": False}])
+        {"count": 2, "columns": {"id": [1, 2], "was_taken": [True, False]}}
+    """
+    names = list(rows[0]) if rows else []
+    return {
+        "count": len(rows),
+        "columns": {name: [row[name] for row in rows] for name in names},
+    }
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renders lists of objects as JSON arrays per field instead of an array of objects.
+
+    Selected with `Accept: application/vnd.medtracker.columnar+json` or
+    `?format=columnar`. Field names are written once rather than once per
+    row, which shrinks long histories considerably. Anything other than a
+    list of objects (a single object, an error) is rendered as plain JSON.
+    """
+    media_type = "application/vnd.medtracker.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list) and all(isinstance(row, dict) for row in data[:1]):
+            data = to_columns(data)
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone as dt_timezone
+from itertools import groupby
+
+from .models import DoseLog, day_range
+
+SECONDS_PER_DAY = 24 * 60 * 60
+MAX_TOLERANCE_MINUTES = 24 * 60
+
+
+def slot_offsets(prescribed_per_day: int):
+    """
+    Return the expected dose times of one day, in seconds after midnight.
+
+    Doses are spread evenly over the day, each in the middle of its
+    share of it: one dose a day is expected at 12:00, two at 06:00 and
+    18:00, three at 04:00, 12:00 and 20:00, and so on.
+    """
+    interval = SECONDS_PER_DAY / prescribed_per_day
+    return [int(interval * (i + 0.5)) for i in range(prescribed_per_day)]
+
+
+def default_tolerance(prescribed_per_day: int) -> int:
+    """Half the spacing between doses, so that tolerance windows tile the day."""
+    return SECONDS_PER_DAY // (2 * prescribed_per_day)
+
+
+def missed_slots(prescribed_per_day, range_start, days, taken, tolerance):
+    """
+    Match expected dose slots against taken doses in one merge pass.
+
+    Both sequences are sorted, so a single forward sweep pairs each slot
+    with the earliest unused dose inside its tolerance window. Each dose
+    satisfies at most one slot. Because every window has the same width,
+    this greedy pairing matches as many slots as possible.
+
+    Args:
+        prescribed_per_day (int): Expected doses per day.
+        range_start (int): POSIX timestamp of the first day's midnight.
+        days (int): Number of days in the period.
+        taken (Sequence[float]): Sorted POSIX timestamps of taken doses.
+        tolerance (int): Seconds a dose may be early or late for a slot.
+
+    Returns:
+        tuple[int, list[int]]: The number of expected slots and the
+        timestamps of the slots no dose was matched to.
+    """
+    if prescribed_per_day <= 0 or days <= 0:
+        return 0, []
+
+    offsets = slot_offsets(prescribed_per_day)
+    missed = []
+    position, count = 0, len(taken)
+    for day in range(days):
+        day_start = range_start + day * SECONDS_PER_DAY
+        for offset in offsets:
+            slot = day_start + offset
+            while position < count and taken[position] < slot - tolerance:
+                position += 1
+            if position < count and taken[position] <= slot + tolerance:
+                position += 1
+            else:
+                missed.append(slot)
+    return days * prescribed_per_day, missed
+
+
+def _as_datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def _bound_as_datetime(timestamp):
+    """Like `_as_datetime`, but clamped to the range of datetimes for query bounds."""
+    try:
+        return _as_datetime(timestamp)
+    except (OverflowError, ValueError, OSError):
+        extreme = datetime.max if timestamp > 0 else datetime.min
+        return extreme.replace(tzinfo=dt_timezone.utc)
+
+
+def missed_doses_report(medications, start_date, end_date, tolerance_minutes=None):
+    """
+    Find missed doses for several medications between two dates (inclusive).
+
+    All relevant dose logs are fetched in a single query ordered by
+    medication and time and streamed in chunks; each medication's logs
+    are merged against its expected slots as soon as they have been
+    read, so only one medication's history is held in memory at a time.
+
+    Args:
+        medications (Iterable[Medication]): Medications to evaluate.
+        start_date (date): First day of the period.
+        end_date (date): Last day of the period.
+        tolerance_minutes (int | None): How early or late a dose may be
+            and still count for a slot, at most `MAX_TOLERANCE_MINUTES`.
+            Defaults to half the spacing between doses.
+
+    Returns:
+        list[dict]: Per medication, the `expected`, `taken` and
+        `missed_count` totals and the `missed` slot datetimes.
+
+    Raises:
+        ValueError: If start_date > end_date or the tolerance is out of range.
+    """
+    if start_date > end_date:
+        raise ValueError("start_date must be before or equal to end_date")
+    if tolerance_minutes is not None and not 0 <= tolerance_minutes <= MAX_TOLERANCE_MINUTES:
+        raise ValueError(f"tolerance must be between 0 and {MAX_TOLERANCE_MINUTES} minutes")
+
+    medications = {medication.pk: medication for medication in medications}
+    if not medications:
+        return []
+
+    lower, upper = day_range(start_date, end_date)
+    days = (end_date - start_date).days + 1
+    range_start = lower.timestamp()
+    tolerances = {
+        pk: tolerance_minutes * 60 if tolerance_minutes is not None
+        else default_tolerance(max(medication.prescribed_per_day, 1))
+        for pk, medication in medications.items()
+    }
+    margin = max(tolerances.values())
+
+    logs = (
+        DoseLog.objects.filter(
+            medication_id__in=list(medications),
+            was_taken=True,
+            taken_at__gte=_bound_as_datetime(range_start - margin),
+            taken_at__lt=_bound_as_datetime(upper.timestamp() + margin),
+        )
+        .order_by("medication_id", "taken_at")
+        .values_list("medication_id", "taken_at")
+    )
+
+    def report_for(pk, taken):
+        medication = medications[pk]
+        expected, missed = missed_slots(
+            medication.prescribed_per_day, range_start, days, taken, tolerances[pk]
+        )
+        return {
+            "medication_id": pk,
+            "expected": expected,
+            "taken": expected - len(missed),
+            "missed_count": len(missed),
+            "missed": [_as_datetime(slot) for slot in missed],
+        }
+
+    reports = {
+        pk: report_for(pk, [taken_at.timestamp() for _, taken_at in rows])
+        for pk, rows in groupby(logs.iterator(chunk_size=5000), key=lambda row: row[0])
+    }
+    return [reports[pk] if pk in reports else report_for(pk, []) for pk in medications]
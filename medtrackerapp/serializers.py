@@ -1,5 +1,50 @@
 from rest_framework import serializers
-from .models import Medication, DoseLog, Note
+from .models import Medication, DoseLog, Note, Job
+
+
+EXPANDED_MEDICATION_FIELDS = ("id", "name", "dosage_mg")
+
+
+class OwnedMedicationField(serializers.PrimaryKeyRelatedField):
+    """
+    Medication primary key restricted to the requesting user's medications.
+
+    Prevents logging doses or notes against another patient's medication;
+    foreign ids are reported as "does not exist".
+    """
+
+    def get_queryset(self):
+        request = self.context.get("request")
+        user = request.user if request is not None else None
+        return Medication.objects.for_owner(user)
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets and inline medication expansion.
+
+    Reads two optional keys from the serializer context:
+        - `fields`: names of the fields to keep; all others are dropped.
+        - `expand`: names of relations to render inline. Only
+          `medication` is supported and it is rendered with
+          `EXPANDED_MEDICATION_FIELDS` instead of a bare primary key.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if "medication" in self.context.get("expand", ()) and "medication" in data:
+            medication = instance.medication
+            data["medication"] = {
+                field: getattr(medication, field) for field in EXPANDED_MEDICATION_FIELDS
+            }
+        return data
 
 class MedicationSerializer(serializers.ModelSerializer):
     adherence = serializers.SerializerMethodField()
@@ -12,14 +57,66 @@ class MedicationSerializer(serializers.ModelSerializer):
         return obj.adherence_rate()
 
 
-class DoseLogSerializer(serializers.ModelSerializer):
+class DoseLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    medication = OwnedMedicationField()
+
     class Meta:
         model = DoseLog
         fields = ["id", "medication", "taken_at", "was_taken"]
 
 
-class NoteSerializer(serializers.ModelSerializer):
+class NoteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    medication = OwnedMedicationField()
+
     class Meta:
         model = Note
         fields = ["id", "medication", "text", "created_at"]
         read_only_fields = ["created_at"]
+
+
+class DashboardMedicationSerializer(MedicationSerializer):
+    """
+    A medication with its recent activity, as shown on the dashboard.
+
+    Expects the medication to be annotated with `taken_in_period` and to
+    carry prefetched `recent_logs` and `recent_notes` lists; the period
+    length is read from `context["days"]`.
+    """
+    expected_doses = serializers.SerializerMethodField()
+    taken_doses = serializers.IntegerField(source="taken_in_period", read_only=True)
+    period_adherence = serializers.SerializerMethodField()
+    recent_logs = DoseLogSerializer(many=True, read_only=True)
+    recent_notes = NoteSerializer(many=True, read_only=True)
+
+    class Meta(MedicationSerializer.Meta):
+        fields = [
+            *MedicationSerializer.Meta.fields,
+            "expected_doses",
+            "taken_doses",
+            "period_adherence",
+            "recent_logs",
+            "recent_notes",
+        ]
+
+    def get_expected_doses(self, obj):
+        try:
+            return obj.expected_doses(self.context["days"])
+        except ValueError:
+            # No doses are scheduled for this medication.
+            return 0
+
+    def get_period_adherence(self, obj):
+        expected = self.get_expected_doses(obj)
+        if expected == 0:
+            return 0.0
+        return round((obj.taken_in_period / expected) * 100, 2)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id", "name", "status", "attempts", "result", "error",
+            "created_at", "started_at", "finished_at",
+        ]
+        read_only_fields = fields
@@ -1,4 +1,17 @@
-import requests
+from django.conf import settings
+from django.core.cache import cache
+
+
+def __getattr__(name):
+    # `requests` (and the urllib3/TLS stack behind it) is only imported
+    # when OpenFDA is actually called, so processes that never look up
+    # drug info do not pay for it at startup. It stays reachable as
+    # `medtrackerapp.services.requests` for callers and tests.
+    if name == "requests":
+        import requests
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class DrugInfoService:
     """
@@ -8,11 +21,99 @@ class DrugInfoService:
     such as name, manufacturer, purpose, and warnings from the
     official OpenFDA API.
 
+    Lookups through `get_cached_drug_info()` follow `DRUG_INFO_MODE`:
+    "local-first" answers from the `DrugLabel` mirror (filled by the
+    `import_drug_labels` command) and only calls OpenFDA on a miss,
+    "local" never calls OpenFDA and "remote" never reads the mirror.
+
     See:
         https://open.fda.gov/apis/drug/label/
     """
 
     BASE_URL = "https://api.fda.gov/drug/label.json"
+    CACHE_TIMEOUT = 60 * 60 * 24
+
+    @staticmethod
+    def cache_key(drug_name: str) -> str:
+        """Return the cache key under which info for `drug_name` is stored."""
+        return f"drug-info:{drug_name.lower()}"
+
+    @staticmethod
+    def summarize(record: dict, drug_name: str = "") -> dict:
+        """
+        Reduce an OpenFDA label record to the fields this app uses.
+
+        Args:
+            record (dict): One entry of an OpenFDA `results` array.
+            drug_name (str): Name to report if the label has no generic name.
+
+        Returns:
+            dict: See `get_drug_info()`.
+        """
+        openfda = record.get("openfda", {})
+
+        return {
+            "name": openfda.get("generic_name", [drug_name])[0] if isinstance(openfda.get("generic_name"), list) else openfda.get("generic_name", drug_name),
+            "manufacturer": openfda.get("manufacturer_name", ["Unknown"])[0] if isinstance(openfda.get("manufacturer_name"), list) else openfda.get("manufacturer_name", "Unknown"),
+            "warnings": record.get("warnings", ["No warnings available"]),
+            "purpose": record.get("purpose", ["Not specified"]),
+        }
+
+    @staticmethod
+    def get_local_drug_info(drug_name: str):
+        """
+        Look a drug up in the local `DrugLabel` mirror.
+
+        Args:
+            drug_name (str): The generic name to look up (any case).
+
+        Returns:
+            dict | None: See `get_drug_info()`, or None if the mirror has
+            no label for this name.
+        """
+        # Imported here because models imports this module.
+        from .models import DrugLabel
+
+        label = DrugLabel.objects.lookup(drug_name)
+        return label.info() if label is not None else None
+
+    @classmethod
+    def get_cached_drug_info(cls, drug_name: str):
+        """
+        Return drug information, serving repeated lookups locally.
+
+        Unless `DRUG_INFO_MODE` is "remote", the local label mirror is
+        consulted first. Successful `get_drug_info()` results are cached
+        for `CACHE_TIMEOUT` seconds; errors are not cached. The
+        background `warm_drug_info` job calls this right after a
+        medication is created so that the first `info` request does not
+        wait on OpenFDA.
+
+        Args:
+            drug_name (str): The name of the medication to look up.
+
+        Returns:
+            dict: See `get_drug_info()`.
+
+        Raises:
+            ValueError: If the name is not found locally in "local" mode.
+            ValueError, requests.exceptions.RequestException:
+                As raised by `get_drug_info()` on a miss otherwise.
+        """
+        mode = settings.DRUG_INFO_MODE
+        if mode != "remote" and drug_name:
+            info = cls.get_local_drug_info(drug_name)
+            if info is not None:
+                return info
+            if mode == "local":
+                raise ValueError("No results found for this medication.")
+
+        key = cls.cache_key(drug_name)
+        info = cache.get(key)
+        if info is None:
+            info = cls.get_drug_info(drug_name)
+            cache.set(key, info, cls.CACHE_TIMEOUT)
+        return info
 
     @classmethod
     def get_drug_info(cls, drug_name: str):
@@ -57,6 +158,8 @@ class DrugInfoService:
         if not drug_name:
             raise ValueError("drug_name is required")
 
+        import requests
+
         params = {"search": f"openfda.generic_name:{drug_name.lower()}", "limit": 1}
 
         resp = requests.get(cls.BASE_URL, params=params, timeout=10)
@@ -68,12 +171,4 @@ class DrugInfoService:
         if not results:
             raise ValueError("No results found for this medication.")
 
-        record = results[0]
-        openfda = record.get("openfda", {})
-
-        return {
-            "name": openfda.get("generic_name", [drug_name])[0] if isinstance(openfda.get("generic_name"), list) else openfda.get("generic_name", drug_name),
-            "manufacturer": openfda.get("manufacturer_name", ["Unknown"])[0] if isinstance(openfda.get("manufacturer_name"), list) else openfda.get("manufacturer_name", "Unknown"),
-            "warnings": record.get("warnings", ["No warnings available"]),
-            "purpose": record.get("purpose", ["Not specified"]),
-        }
+        return cls.summarize(results[0], drug_name)
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import medication_names
+from .events import publish_dose_event, wants_dose_events
+from .models import DoseLog, Medication, Note, Tombstone, next_change_seq
+
+
+def _update_name_index(pk, name=None, owner_id=None):
+    if settings.MEDICATION_SUGGEST_BACKEND != "memory":
+        return
+    if name is None:
+        medication_names.remove(pk)
+    else:
+        medication_names.add(pk, name, owner_id)
+    medication_names.publish()
+
+
+@receiver(post_save, sender=Medication)
+def index_medication_name(sender, instance, **kwargs):
+    """Keep the name index in step with saved medications."""
+    pk, name, owner_id = instance.pk, instance.name, instance.owner_id
+    if instance.deleted_at is not None:
+        transaction.on_commit(lambda: _update_name_index(pk))
+    else:
+        transaction.on_commit(lambda: _update_name_index(pk, name, owner_id))
+
+
+@receiver(post_delete, sender=Medication)
+def unindex_medication_name(sender, instance, **kwargs):
+    """Drop deleted medications from the name index."""
+    pk = instance.pk
+    transaction.on_commit(lambda: _update_name_index(pk))
+
+
+@receiver(post_save, sender=DoseLog)
+def broadcast_dose_log(sender, instance, created, using, **kwargs):
+    """Push created and updated dose logs to live event streams."""
+    if wants_dose_events(instance.owner_id):
+        # Imported here so that loading the app (e.g. for `migrate`) does
+        # not pull in Django REST framework.
+        from .serializers import DoseLogSerializer
+
+        data = dict(DoseLogSerializer(instance).data)
+        publish_dose_event("created" if created else "updated", data, instance.owner_id, using)
+
+
+@receiver(post_delete, sender=Medication, dispatch_uid="tombstone_medication")
+@receiver(post_delete, sender=DoseLog, dispatch_uid="tombstone_doselog")
+@receiver(post_delete, sender=Note, dispatch_uid="tombstone_note")
+def record_tombstone(sender, instance, using, origin=None, **kwargs):
+    """Record deletions so that sync clients can drop their copies."""
+    if isinstance(origin, sender.owner.field.related_model):
+        # The owner's account is being deleted along with all of its
+        # rows; there is nobody left to sync with.
+        return
+    if sender is not Medication and isinstance(origin, Medication):
+        # Removed along with its medication, whose tombstone covers it.
+        return
+    if sender is Medication and instance.deleted_at is not None:
+        # Recorded by soft_delete() already.
+        return
+    Tombstone.objects.using(using).create(
+        owner_id=instance.owner_id,
+        kind=sender._meta.model_name,
+        object_id=instance.pk,
+        change_seq=next_change_seq(using),
+    )
@@ -0,0 +1,104 @@
+import csv
+from datetime import date
+
+from django.conf import settings
+
+from .jobs import heartbeat, job
+from .models import DoseLog, Medication, Note, day_range
+from .services import DrugInfoService
+
+
+@job("warm_drug_info")
+def warm_drug_info(job, medication_id):
+    """
+    Prefetch OpenFDA information for a medication into the cache.
+
+    Returns:
+        dict: The medication id and whether information was found.
+    """
+    medication = Medication.objects.filter(pk=medication_id).only("name").first()
+    if medication is None:
+        return {"medication_id": medication_id, "found": False}
+    try:
+        DrugInfoService.get_cached_drug_info(medication.name)
+    except ValueError:
+        # No label for this name; nothing to cache and nothing to retry.
+        return {"medication_id": medication_id, "found": False}
+    return {"medication_id": medication_id, "found": True}
+
+
+@job("export_doselogs")
+def export_doselogs(job, medication=None, start=None, end=None):
+    """
+    Write the job owner's dose logs to a CSV file under `EXPORT_ROOT`.
+
+    Rows are streamed from the database in chunks, so memory use does
+    not grow with the size of the history.
+
+    Args:
+        medication (int | None): Only export logs for this medication.
+        start, end (str | None): Inclusive ISO date bounds.
+
+    Returns:
+        dict: The export file name and the number of rows written.
+    """
+    logs = DoseLog.objects.filter(owner_id=job.owner_id, medication__deleted_at__isnull=True)
+    if medication is not None:
+        logs = logs.filter(medication_id=medication)
+    if start and end:
+        lower, upper = day_range(date.fromisoformat(start), date.fromisoformat(end))
+        logs = logs.filter(taken_at__gte=lower, taken_at__lt=upper)
+    rows = logs.order_by("taken_at", "id").values_list(
+        "id", "medication_id", "medication__name", "taken_at", "was_taken"
+    )
+
+    export_root = settings.EXPORT_ROOT
+    export_root.mkdir(parents=True, exist_ok=True)
+    filename = f"doselogs-{job.pk}.csv"
+    count = 0
+    with open(export_root / filename, "w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["id", "medication_id", "medication", "taken_at", "was_taken"])
+        for log_id, medication_id, name, taken_at, was_taken in rows.iterator(chunk_size=2000):
+            writer.writerow([log_id, medication_id, name, taken_at.isoformat(), was_taken])
+            count += 1
+            if count % 10_000 == 0:
+                heartbeat(job)
+    return {"file": filename, "rows": count}
+
+
+@job("purge_medication")
+def purge_medication(job, medication_id):
+    """
+    Permanently delete a soft-deleted medication and its history.
+
+    Dose logs and notes are deleted `PURGE_BATCH_SIZE` rows at a time,
+    each batch in its own short transaction, so neither memory use nor
+    lock time grows with the size of the history. The batches use plain
+    DELETE statements: no per-row signals are sent, as the medication's
+    tombstone already tells sync clients to drop its logs and notes.
+    The job can safely be re-run after a failure.
+
+    Returns:
+        dict: The medication id and the number of logs and notes deleted.
+    """
+    medication = Medication.all_objects.filter(pk=medication_id).first()
+    if medication is None:
+        return {"medication_id": medication_id, "logs": 0, "notes": 0}
+    if medication.deleted_at is None:
+        raise ValueError(f"Medication {medication_id} has not been deleted")
+
+    batch_size = settings.PURGE_BATCH_SIZE
+    deleted = {}
+    for key, model in (("logs", DoseLog), ("notes", Note)):
+        deleted[key] = 0
+        rows = model._base_manager.filter(medication_id=medication_id)
+        while True:
+            pks = list(rows.order_by().values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            # _raw_delete() issues a single DELETE without collecting rows.
+            deleted[key] += model._base_manager.filter(pk__in=pks)._raw_delete(rows.db)
+            heartbeat(job)
+    medication.delete()
+    return {"medication_id": medication_id, **deleted}
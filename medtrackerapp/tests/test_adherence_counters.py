@@ -0,0 +1,156 @@
+import threading
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from medtrackerapp.models import DoseLog, Medication, apply_adherence_deltas
+
+
+class AdherenceCounterTests(TestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.other = Medication.objects.create(name="Ibuprofen", dosage_mg=200, prescribed_per_day=1)
+
+    def counts(self, medication):
+        medication.refresh_from_db()
+        return medication.total_count, medication.taken_count
+
+    def test_create_toggle_move_and_delete(self):
+        log = DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now(), was_taken=False)
+        self.assertEqual(self.counts(self.med), (2, 1))
+
+        log.was_taken = False
+        log.save(update_fields=["was_taken"])
+        self.assertEqual(self.counts(self.med), (2, 0))
+
+        log.medication = self.other
+        log.save()
+        self.assertEqual(self.counts(self.med), (1, 0))
+        self.assertEqual(self.counts(self.other), (1, 0))
+
+        log.delete()
+        self.assertEqual(self.counts(self.other), (0, 0))
+
+    def test_adherence_rate_needs_no_query(self):
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now(), was_taken=False)
+        med = Medication.objects.get(pk=self.med.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(med.adherence_rate(), 50.0)
+
+    def test_bulk_paths(self):
+        DoseLog.objects.bulk_create(
+            DoseLog(medication=med, taken_at=timezone.now(), was_taken=taken)
+            for med, taken in [(self.med, True), (self.med, False), (self.other, True)]
+        )
+        self.assertEqual(self.counts(self.med), (2, 1))
+        self.assertEqual(self.counts(self.other), (1, 1))
+
+        self.assertEqual(DoseLog.objects.filter(was_taken=False).update(was_taken=True), 1)
+        self.assertEqual(self.counts(self.med), (2, 2))
+
+        DoseLog.objects.filter(medication=self.other).update(medication=self.med)
+        self.assertEqual(self.counts(self.med), (3, 3))
+        self.assertEqual(self.counts(self.other), (0, 0))
+
+        deleted, _ = DoseLog.objects.filter(medication=self.med).delete()
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self.counts(self.med), (0, 0))
+
+    def test_deltas_are_applied_in_id_order(self):
+        with CaptureQueriesContext(connection) as queries:
+            apply_adherence_deltas({self.other.pk: (1, 1), self.med.pk: (1, 0)})
+        updated = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "medtrackerapp_medication"')]
+        self.assertEqual(len(updated), 2)
+        self.assertIn(f'"id" = {self.med.pk}', updated[0])
+        self.assertIn(f'"id" = {self.other.pk}', updated[1])
+
+    def test_counter_changes_are_synced(self):
+        before = Medication.objects.get(pk=self.med.pk).change_seq
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        after = Medication.objects.get(pk=self.med.pk)
+        self.assertGreater(after.change_seq, before)
+        response = self.client.get(reverse("sync-list"), {"since": before})
+        synced = {m["id"]: m for m in response.data["medications"]}
+        self.assertEqual(synced[self.med.pk]["adherence"], 100.0)
+
+    def test_saving_stale_medication_keeps_counters(self):
+        stale = Medication.objects.get(pk=self.med.pk)
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        stale.name = "Aspirin EC"
+        stale.save()
+        self.assertEqual(self.counts(self.med), (1, 1))
+
+    def test_repair_command_recomputes_counters(self):
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now(), was_taken=False)
+        Medication.objects.update(total_count=7, taken_count=7)
+        out = StringIO()
+        call_command("repair_adherence_counts", "--batch-size", "1", stdout=out)
+        self.assertIn("Checked 2 medication(s), corrected 2", out.getvalue())
+        self.assertEqual(self.counts(self.med), (2, 1))
+        self.assertEqual(self.counts(self.other), (0, 0))
+
+
+class AdherenceCounterViewTests(APITestCase):
+
+    def test_toggling_through_api_updates_adherence(self):
+        med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        log = DoseLog.objects.create(medication=med, taken_at=timezone.now())
+        self.client.patch(reverse("doselog-detail", args=[log.id]), {"was_taken": False}, format="json")
+        response = self.client.get(reverse("medication-detail", args=[med.id]))
+        self.assertEqual(response.data["adherence"], 0.0)
+
+
+class ConcurrentAdherenceCounterTests(TransactionTestCase):
+
+    WRITERS = 4
+    LOGS_PER_WRITER = 10
+
+    def write_logs(self, medication_id, errors):
+        try:
+            for i in range(self.LOGS_PER_WRITER):
+                for attempt in range(200):
+                    try:
+                        DoseLog.objects.create(
+                            medication_id=medication_id,
+                            taken_at=timezone.now(),
+                            was_taken=i % 2 == 0,
+                        )
+                        break
+                    except OperationalError:
+                        # SQLite does not queue writers; back off and retry.
+                        time.sleep(0.005)
+                else:
+                    raise AssertionError("writer could not get the database")
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_parallel_writers_keep_counters_exact(self):
+        med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        errors = []
+        threads = [
+            threading.Thread(target=self.write_logs, args=(med.pk, errors))
+            for _ in range(self.WRITERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        close_old_connections()
+
+        self.assertEqual(errors, [])
+        med.refresh_from_db()
+        total = self.WRITERS * self.LOGS_PER_WRITER
+        self.assertEqual((med.total_count, med.taken_count), (total, total // 2))
+        self.assertEqual(DoseLog.objects.filter(medication=med).count(), total)
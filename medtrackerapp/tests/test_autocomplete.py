@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp.autocomplete import MedicationNameIndex, medication_names
+from medtrackerapp.models import Medication
+
+
+class MedicationNameIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = MedicationNameIndex()
+        self.index.load([
+            (1, "Ibuprofen", None),
+            (2, "ibandronate", None),
+            (3, "Aspirin", None),
+            (4, "Insulin", None),
+            (5, "Ibuprofen", 7),
+        ])
+
+    def test_suggest_is_case_insensitive_and_sorted(self):
+        self.assertEqual(
+            self.index.suggest("IB"),
+            [{"id": 2, "name": "ibandronate"}, {"id": 1, "name": "Ibuprofen"}],
+        )
+
+    def test_suggest_respects_limit(self):
+        self.assertEqual(len(self.index.suggest("i", limit=2)), 2)
+
+    def test_suggest_no_match(self):
+        self.assertEqual(self.index.suggest("zz"), [])
+
+    def test_add_and_rename(self):
+        self.index.add(6, "Ibuprofen Junior")
+        self.index.add(1, "Acetaminophen")
+        self.assertEqual(self.index.suggest("ibu"), [{"id": 6, "name": "Ibuprofen Junior"}])
+        self.assertEqual(self.index.suggest("ace"), [{"id": 1, "name": "Acetaminophen"}])
+
+    def test_suggest_is_scoped_to_owner(self):
+        self.assertEqual(self.index.suggest("ibu", owner_id=7), [{"id": 5, "name": "Ibuprofen"}])
+        self.assertEqual(self.index.suggest("asp", owner_id=7), [])
+        self.assertEqual(self.index.suggest("asp", owner_id=8), [])
+
+    def test_remove(self):
+        self.index.remove(3)
+        self.assertEqual(self.index.suggest("a"), [])
+
+    def test_updates_ignored_until_loaded(self):
+        index = MedicationNameIndex()
+        index.add(1, "Aspirin")
+        Medication.objects.create(name="Atenolol", dosage_mg=50, prescribed_per_day=1)
+        self.assertEqual([s["name"] for s in index.suggest("a")], ["Atenolol"])
+
+
+class MedicationSuggestViewTests(APITestCase):
+
+    def setUp(self):
+        medication_names.invalidate()
+        self.addCleanup(medication_names.invalidate)
+        Medication.objects.create(name="Ibuprofen", dosage_mg=200, prescribed_per_day=3)
+        Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.url = reverse("medication-suggest")
+
+    def test_suggest(self):
+        response = self.client.get(self.url, {"prefix": "ibu"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([s["name"] for s in response.data], ["Ibuprofen"])
+
+    @override_settings(MEDICATION_SUGGEST_BACKEND="memory")
+    def test_suggest_tracks_create_and_delete(self):
+        self.client.get(self.url, {"prefix": "a"})  # load the index
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("medication-list"),
+                {"name": "Atenolol", "dosage_mg": 50, "prescribed_per_day": 1},
+                format="json",
+            )
+        response = self.client.get(self.url, {"prefix": "a"})
+        self.assertEqual([s["name"] for s in response.data], ["Aspirin", "Atenolol"])
+
+        aspirin = Medication.objects.get(name="Aspirin")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse("medication-detail", args=[aspirin.id]))
+        response = self.client.get(self.url, {"prefix": "a"})
+        self.assertEqual([s["name"] for s in response.data], ["Atenolol"])
+
+    @override_settings(MEDICATION_SUGGEST_BACKEND="memory", MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL=0)
+    def test_suggest_reloads_after_change_in_other_process(self):
+        self.client.get(self.url, {"prefix": "a"})  # load the index
+        # Saved without running on-commit hooks, as if by another process.
+        Medication.objects.create(name="Atenolol", dosage_mg=50, prescribed_per_day=1)
+        response = self.client.get(self.url, {"prefix": "a"})
+        self.assertEqual([s["name"] for s in response.data], ["Aspirin"])
+
+        MedicationNameIndex().publish()
+        response = self.client.get(self.url, {"prefix": "a"})
+        self.assertEqual([s["name"] for s in response.data], ["Aspirin", "Atenolol"])
+
+    @override_settings(MEDICATION_SUGGEST_VERSION_CHECK_INTERVAL=60)
+    def test_version_is_checked_once_per_interval(self):
+        index = MedicationNameIndex()
+        with patch("medtrackerapp.autocomplete.time.monotonic", return_value=1000.0):
+            index.suggest("a")
+        MedicationNameIndex().publish()
+        with patch("medtrackerapp.autocomplete.cache.get") as cache_get, \
+                patch("medtrackerapp.autocomplete.time.monotonic", return_value=1059.0):
+            index.suggest("a")
+        cache_get.assert_not_called()
+        with patch("medtrackerapp.autocomplete.time.monotonic", return_value=1060.0), \
+                self.assertNumQueries(1):
+            index.suggest("a")
+
+    def test_own_changes_do_not_force_reload(self):
+        index = MedicationNameIndex()
+        index.suggest("a")
+        index.add(99, "Atenolol")
+        index.publish()
+        with self.assertNumQueries(0):
+            self.assertEqual([s["name"] for s in index.suggest("a")], ["Aspirin", "Atenolol"])
+
+    def test_suggest_database_backend(self):
+        response = self.client.get(self.url, {"prefix": "ASP"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([s["name"] for s in response.data], ["Aspirin"])
+
+    def test_suggest_missing_prefix(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_suggest_invalid_limit(self):
+        response = self.client.get(self.url, {"prefix": "a", "limit": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
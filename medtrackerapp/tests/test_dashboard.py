@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp.models import DoseLog, Medication, Note
+
+
+class DashboardViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("alice")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("dashboard-list")
+        self.now = timezone.now()
+
+    def add_medication(self, name, logs=3, notes=2):
+        med = Medication.objects.create(owner=self.user, name=name, dosage_mg=10, prescribed_per_day=2)
+        DoseLog.objects.bulk_create(
+            DoseLog(
+                owner=self.user,
+                medication=med,
+                taken_at=self.now - timedelta(days=i),
+                was_taken=i != 1,
+            )
+            for i in range(logs)
+        )
+        for i in range(notes):
+            Note.objects.create(medication=med, text=f"{name} note {i}")
+        return med
+
+    def test_dashboard_contents(self):
+        med = self.add_medication("Aspirin", logs=10, notes=7)
+        response = self.client.get(self.url, {"days": 7, "recent": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["days"], 7)
+        self.assertEqual(response.data["end"] - response.data["start"], timedelta(days=6))
+
+        [entry] = response.data["medications"]
+        self.assertEqual(entry["id"], med.id)
+        self.assertEqual(entry["adherence"], 90.0)
+        self.assertEqual(entry["expected_doses"], 14)
+        # Logs from today and the previous six days, minus the missed one.
+        self.assertEqual(entry["taken_doses"], 6)
+        self.assertEqual(entry["period_adherence"], round(6 / 14 * 100, 2))
+        self.assertEqual(
+            [log["id"] for log in entry["recent_logs"]],
+            list(DoseLog.objects.order_by("-taken_at").values_list("id", flat=True)[:3]),
+        )
+        self.assertEqual([n["text"] for n in entry["recent_notes"]], [f"Aspirin note {i}" for i in (6, 5, 4)])
+
+    def test_query_count_is_constant(self):
+        self.add_medication("Aspirin")
+        # Medications with period counts, recent logs, recent notes.
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        for i in range(5):
+            self.add_medication(f"Med {i}")
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["medications"]), 6)
+        self.assertTrue(all(len(m["recent_logs"]) == 3 for m in response.data["medications"]))
+
+    def test_period_counts_do_not_join_dose_history(self):
+        self.add_medication("Aspirin")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        medications_sql = queries[0]["sql"]
+        self.assertNotIn("JOIN", medications_sql)
+        self.assertNotIn("GROUP BY \"medtrackerapp_medication\"", medications_sql)
+
+    def test_medication_without_schedule_expects_no_doses(self):
+        med = self.add_medication("Vitamin D", logs=1, notes=0)
+        Medication.objects.filter(pk=med.pk).update(prescribed_per_day=0)
+        [entry] = self.client.get(self.url).data["medications"]
+        self.assertEqual((entry["expected_doses"], entry["period_adherence"]), (0, 0.0))
+
+    def test_scoped_to_user(self):
+        other = get_user_model().objects.create_user("bob")
+        Medication.objects.create(owner=other, name="Atenolol", dosage_mg=50, prescribed_per_day=1)
+        self.assertEqual(self.client.get(self.url).data["medications"], [])
+
+    def test_invalid_parameters_return_400(self):
+        for params in ({"days": "0"}, {"days": "abc"}, {"recent": "100"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
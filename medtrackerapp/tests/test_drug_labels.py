@@ -0,0 +1,107 @@
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from medtrackerapp.management.commands.import_drug_labels import iter_results
+from medtrackerapp.models import DrugLabel
+from medtrackerapp.services import DrugInfoService
+
+FIXTURE = Path(__file__).parent / "fixtures" / "drug_labels.json"
+
+
+class IterResultsTests(TestCase):
+
+    def test_streams_records_across_small_chunks(self):
+        with open(FIXTURE, encoding="utf-8") as stream:
+            records = list(iter_results(stream, chunk_size=7))
+        self.assertEqual([r["id"][-4:] for r in records], ["0001", "0002", "0003", "0004"])
+        self.assertEqual(records[3]["purpose"], ['Sunscreen "broad spectrum" [SPF 30]'])
+
+    def test_empty_results(self):
+        self.assertEqual(list(iter_results(io.StringIO('{"meta": {}, "results": []}'))), [])
+
+    def test_rejects_non_object(self):
+        with self.assertRaises(ValueError):
+            list(iter_results(io.StringIO("[1, 2]")))
+
+
+class ImportDrugLabelsCommandTests(TestCase):
+
+    def import_labels(self, *paths):
+        out = io.StringIO()
+        call_command("import_drug_labels", *paths, "--batch-size", "2", stdout=out)
+        return out.getvalue()
+
+    def test_imports_labels_with_generic_names(self):
+        output = self.import_labels(str(FIXTURE))
+        self.assertIn("Imported 3 label(s), skipped 1", output)
+        self.assertEqual(
+            sorted(DrugLabel.objects.values_list("generic_name", flat=True)),
+            ["aspirin", "aspirin", "ibuprofen"],
+        )
+
+    def test_reimport_updates_in_place(self):
+        self.import_labels(str(FIXTURE))
+        DrugLabel.objects.filter(label_id="0a1b2c3d-0003").update(manufacturer="Stale")
+        self.import_labels(str(FIXTURE))
+        self.assertEqual(DrugLabel.objects.count(), 3)
+        self.assertEqual(DrugLabel.objects.get(label_id="0a1b2c3d-0003").manufacturer, "McKesson")
+
+    def test_imports_zip_archive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            archive = Path(directory) / "drug-label-0001-of-0001.json.zip"
+            with zipfile.ZipFile(archive, "w") as zf:
+                zf.write(FIXTURE, "drug-label-0001-of-0001.json")
+            self.import_labels(str(archive))
+        self.assertEqual(DrugLabel.objects.count(), 3)
+
+    def test_malformed_file_raises_command_error(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as handle:
+            handle.write('{"results": [{"id": ')
+        try:
+            with self.assertRaises(CommandError):
+                self.import_labels(handle.name)
+        finally:
+            Path(handle.name).unlink()
+
+
+class LocalFirstDrugInfoTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        call_command("import_drug_labels", str(FIXTURE), stdout=io.StringIO())
+
+    def test_lookup_returns_latest_label(self):
+        self.assertEqual(DrugLabel.objects.lookup(" Aspirin ").manufacturer, "Bayer")
+        self.assertIsNone(DrugLabel.objects.lookup("paracetamol"))
+
+    @patch("medtrackerapp.services.requests.get")
+    def test_local_hit_skips_network(self, mock_get):
+        info = DrugInfoService.get_cached_drug_info("ASPIRIN")
+        self.assertEqual(info["manufacturer"], "Bayer")
+        self.assertEqual(info["purpose"], ["Pain reliever", "Fever reducer"])
+        mock_get.assert_not_called()
+
+    @patch("medtrackerapp.services.DrugInfoService.get_drug_info")
+    def test_local_miss_falls_back_to_network(self, mock_get_info):
+        mock_get_info.return_value = {"name": "Paracetamol"}
+        self.assertEqual(DrugInfoService.get_cached_drug_info("paracetamol"), {"name": "Paracetamol"})
+        mock_get_info.assert_called_once_with("paracetamol")
+
+    @override_settings(DRUG_INFO_MODE="local")
+    @patch("medtrackerapp.services.DrugInfoService.get_drug_info")
+    def test_local_mode_never_calls_network(self, mock_get_info):
+        with self.assertRaises(ValueError):
+            DrugInfoService.get_cached_drug_info("paracetamol")
+        mock_get_info.assert_not_called()
+
+    @override_settings(DRUG_INFO_MODE="remote")
+    @patch("medtrackerapp.services.DrugInfoService.get_drug_info")
+    def test_remote_mode_ignores_mirror(self, mock_get_info):
+        mock_get_info.return_value = {"name": "ASPIRIN", "manufacturer": "Remote"}
+        self.assertEqual(DrugInfoService.get_cached_drug_info("aspirin")["manufacturer"], "Remote")
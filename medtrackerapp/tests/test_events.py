@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import json
+from unittest.mock import MagicMock, patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from medtrackerapp.events import (
+    Broadcaster, PostgresListener, dose_events, event_stream, format_sse,
+)
+from medtrackerapp.models import DoseLog, Medication
+
+
+def make_event(log_id, medication, owner=None, kind="created"):
+    return {"type": kind, "owner": owner, "log": {"id": log_id, "medication": medication}}
+
+
+class BroadcasterTests(TestCase):
+
+    async def test_publish_filters_by_owner_and_medication(self):
+        broadcaster = Broadcaster()
+        all_meds = broadcaster.subscribe(owner_id=1)
+        one_med = broadcaster.subscribe(owner_id=1, medication_id=5)
+        other_owner = broadcaster.subscribe(owner_id=2)
+
+        broadcaster.publish(make_event(10, medication=5, owner=1))
+        broadcaster.publish(make_event(11, medication=6, owner=1))
+        await asyncio.sleep(0)
+
+        self.assertEqual(all_meds.queue.qsize(), 2)
+        self.assertEqual(one_med.queue.qsize(), 1)
+        self.assertEqual((await one_med.get())["log"]["id"], 10)
+        self.assertTrue(other_owner.queue.empty())
+
+    async def test_unsubscribe(self):
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe(owner_id=None)
+        self.assertEqual(broadcaster.subscriber_count, 1)
+        broadcaster.unsubscribe(subscription)
+        self.assertEqual(broadcaster.subscriber_count, 0)
+        self.assertFalse(broadcaster.has_subscribers(None))
+
+    async def test_slow_subscriber_drops_events(self):
+        broadcaster = Broadcaster(max_queue=1)
+        subscription = broadcaster.subscribe(owner_id=None)
+        broadcaster.publish(make_event(1, medication=1))
+        broadcaster.publish(make_event(2, medication=1))
+        await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.dropped, 1)
+
+    def test_format_sse(self):
+        message = format_sse(make_event(7, medication=3, kind="updated"))
+        self.assertEqual(
+            message,
+            'id: 7\nevent: updated\ndata: {"id": 7, "medication": 3}\n\n',
+        )
+
+
+class DoseEventStreamTests(TestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+
+    async def test_stream_receives_committed_dose_logs(self):
+        response = await self.async_client.get(reverse("doselog-stream"), {"medication": self.med.id})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertIn(b": connected", await anext(stream))
+
+        def log_dose():
+            with self.captureOnCommitCallbacks(execute=True):
+                return DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+
+        log = await sync_to_async(log_dose)()
+        message = (await asyncio.wait_for(anext(stream), timeout=2)).decode()
+        self.assertTrue(message.startswith(f"id: {log.id}\nevent: created\n"))
+        data = json.loads(message.split("data: ", 1)[1])
+        self.assertEqual(data["medication"], self.med.id)
+        self.assertTrue(data["was_taken"])
+
+        # A client disconnect cancels the pending read, which ends the subscription
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertFalse(dose_events.has_subscribers(None))
+
+    async def test_event_stream_unsubscribes_on_close(self):
+        stream = event_stream(owner_id=None, medication_id=None, keepalive=0.01)
+        self.assertIn("connected", await anext(stream))
+        self.assertTrue(dose_events.has_subscribers(None))
+        self.assertEqual(await anext(stream), ": keep-alive\n\n")
+        await stream.aclose()
+        self.assertFalse(dose_events.has_subscribers(None))
+
+    async def test_stream_uses_api_authentication(self):
+        user = await sync_to_async(get_user_model().objects.create_user)("alice", password="secret")
+        credentials = base64.b64encode(b"alice:secret").decode()
+        response = await self.async_client.get(
+            reverse("doselog-stream"), headers={"Authorization": f"Basic {credentials}"}
+        )
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        self.assertTrue(dose_events.has_subscribers(user.pk))
+        self.assertFalse(dose_events.has_subscribers(None))
+        await response.streaming_content.aclose()
+
+    async def test_stream_rejects_invalid_credentials(self):
+        credentials = base64.b64encode(b"alice:wrong").decode()
+        response = await self.async_client.get(
+            reverse("doselog-stream"), headers={"Authorization": f"Basic {credentials}"}
+        )
+        self.assertIn(response.status_code, (401, 403))
+        self.assertIn("error", json.loads(response.content))
+
+    async def test_stream_invalid_medication(self):
+        response = await self.async_client.get(reverse("doselog-stream"), {"medication": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_no_event_work_without_subscribers(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        self.assertEqual(callbacks, [])
+
+
+class PostgresListenerTests(SimpleTestCase):
+
+    def test_failed_connection_is_closed_before_reconnecting(self):
+        listener = PostgresListener(Broadcaster())
+        conn = MagicMock()
+
+        def fail(*args):
+            listener.stop()
+            raise OperationalError("server closed the connection")
+
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = fail
+        wrapper = connections["default"]
+        with patch.object(wrapper, "get_connection_params", return_value={}), \
+                patch.object(wrapper, "get_new_connection", return_value=conn), \
+                self.assertLogs("medtrackerapp.events", level="ERROR"):
+            listener.run()
+        conn.close.assert_called_once_with()
@@ -0,0 +1,82 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from medtrackerapp.models import DoseLog, Medication
+
+CSV = """medication,taken_at,was_taken
+Aspirin,2024-01-01T08:00:00Z,true
+aspirin ,2024-01-01 20:00:00,false
+Ibuprofen,2024-01-02T08:00:00+02:00,
+Unknown,2024-01-02T09:00:00Z,true
+Aspirin,2024-01-03T08:00:00Z,1
+"""
+
+
+class ImportDoseLogsCommandTests(TestCase):
+
+    def setUp(self):
+        self.aspirin = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.ibuprofen = Medication.objects.create(name="Ibuprofen", dosage_mg=200, prescribed_per_day=1)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def run_import(self, content, *args):
+        path = self.directory / "doses.csv"
+        path.write_text(content)
+        out, err = StringIO(), StringIO()
+        call_command("import_doselogs", str(path), "--chunk-size", "2", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_rows_and_updates_counters(self):
+        out, err = self.run_import(CSV)
+        self.assertIn("Imported 4 dose log(s)", out)
+        self.assertIn("rows/s", out)
+        self.assertIn("Skipped 1 row(s) with unknown medications: 'Unknown' (1)", err)
+
+        self.aspirin.refresh_from_db()
+        self.assertEqual((self.aspirin.total_count, self.aspirin.taken_count), (3, 2))
+        log = DoseLog.objects.get(medication=self.ibuprofen)
+        self.assertTrue(log.was_taken)
+        self.assertEqual(log.taken_at.isoformat(), "2024-01-02T06:00:00+00:00")
+        seqs = list(DoseLog.objects.values_list("change_seq", flat=True))
+        self.assertEqual(len(set(seqs)), 4)
+        self.assertNotIn(0, seqs)
+
+    def test_names_resolve_within_owner(self):
+        user = get_user_model().objects.create_user("clinic")
+        own = Medication.objects.create(owner=user, name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.run_import(CSV, "--owner", "clinic")
+        self.assertEqual(DoseLog.objects.filter(medication=own, owner=user).count(), 3)
+        self.assertFalse(DoseLog.objects.filter(medication=self.aspirin).exists())
+
+    def test_invalid_rows_raise_command_error(self):
+        with self.assertRaisesMessage(CommandError, "Line 2"):
+            self.run_import("medication,taken_at\nAspirin,yesterday\n")
+
+    def test_short_rows_raise_command_error(self):
+        with self.assertRaisesMessage(CommandError, "Line 3: missing taken_at value"):
+            self.run_import("medication,taken_at\nAspirin,2024-01-01T08:00:00Z\nAspirin\n")
+        with self.assertRaisesMessage(CommandError, "Line 2: missing medication value"):
+            self.run_import("taken_at,medication\n2024-01-01T08:00:00Z\n")
+
+    def test_interrupted_import_keeps_counters_of_loaded_chunks(self):
+        content = CSV + "Aspirin,not a date,true\n"
+        with self.assertRaisesMessage(CommandError, "Line 7"):
+            self.run_import(content)
+        self.aspirin.refresh_from_db()
+        self.assertEqual(DoseLog.objects.filter(medication=self.aspirin).count(), 3)
+        self.assertEqual((self.aspirin.total_count, self.aspirin.taken_count), (3, 2))
+        with self.assertRaisesMessage(CommandError, "Line 2"):
+            self.run_import("medication,taken_at,was_taken\nAspirin,2024-01-01T08:00:00Z,maybe\n")
+
+    def test_missing_columns_and_owner(self):
+        with self.assertRaisesMessage(CommandError, "taken_at"):
+            self.run_import("medication,when\nAspirin,2024-01-01\n")
+        with self.assertRaisesMessage(CommandError, "No user"):
+            self.run_import(CSV, "--owner", "nobody")
@@ -0,0 +1,247 @@
+import csv
+import os
+import shutil
+import signal
+import threading
+import tempfile
+from io import StringIO
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from medtrackerapp import jobs
+from medtrackerapp.models import DoseLog, Job, Medication
+from medtrackerapp.services import DrugInfoService
+
+
+@jobs.job("test_echo")
+def echo(job, value):
+    return {"value": value}
+
+
+@jobs.job("test_fail")
+def fail(job):
+    raise RuntimeError("boom")
+
+
+job_started = threading.Event()
+job_may_finish = threading.Event()
+
+
+@jobs.job("test_block")
+def block(job):
+    job_started.set()
+    job_may_finish.wait(10)
+
+
+class JobQueueTests(TestCase):
+
+    def test_enqueue_and_run(self):
+        job = jobs.enqueue("test_echo", value=3)
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(jobs.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {"value": 3})
+        self.assertEqual(job.attempts, 1)
+
+    def test_enqueue_unknown_job(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("does_not_exist")
+
+    def test_future_jobs_are_not_claimed(self):
+        jobs.enqueue("test_echo", run_after=timezone.now() + timedelta(hours=1), value=1)
+        self.assertIsNone(jobs.claim_job())
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job = jobs.enqueue("test_fail")
+        with self.assertLogs("medtrackerapp.jobs", level="ERROR"):
+            jobs.run_job(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("boom", job.error)
+
+        Job.objects.filter(pk=job.pk).update(attempts=job.max_attempts - 1, run_after=timezone.now())
+        with self.assertLogs("medtrackerapp.jobs", level="ERROR"):
+            jobs.run_job(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def expire_lease(self, job):
+        stale = timezone.now() - timedelta(seconds=settings.JOB_LEASE_TIMEOUT + 1)
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=stale)
+
+    def test_expired_lease_is_reclaimed(self):
+        job = jobs.enqueue("test_echo", value=1)
+        first = jobs.claim_job()
+        self.assertIsNone(jobs.claim_job())
+
+        self.expire_lease(job)
+        with self.assertLogs("medtrackerapp.jobs", level="WARNING"):
+            second = jobs.claim_job()
+        self.assertEqual((second.pk, second.attempts), (job.pk, 2))
+
+        # The first worker finishing late does not overwrite the new attempt.
+        with self.assertLogs("medtrackerapp.jobs", level="WARNING"):
+            jobs.run_job(first)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+
+    def test_heartbeat_renews_lease(self):
+        job = jobs.enqueue("test_echo", value=1)
+        claimed = jobs.claim_job()
+        self.expire_lease(job)
+        jobs.heartbeat(claimed)
+        self.assertIsNone(jobs.claim_job())
+
+    def test_expired_job_without_attempts_left_fails(self):
+        job = jobs.enqueue("test_echo", value=1)
+        jobs.claim_job()
+        Job.objects.filter(pk=job.pk).update(attempts=job.max_attempts)
+        self.expire_lease(job)
+        with self.assertLogs("medtrackerapp.jobs", level="WARNING"):
+            self.assertIsNone(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("stopped responding", job.error)
+
+    def test_release_jobs_requeues_without_counting_attempt(self):
+        job = jobs.enqueue("test_echo", value=1)
+        jobs.claim_job()
+        self.assertEqual(jobs.release_jobs([job.pk]), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 0))
+        self.assertEqual(jobs.run_pending(), 1)
+
+
+class ProcessJobsCommandTests(TransactionTestCase):
+
+    def test_process_jobs_command_drains_queue(self):
+        for value in range(5):
+            jobs.enqueue("test_echo", value=value)
+        out = StringIO()
+        call_command("process_jobs", "--once", "--workers", "1", stdout=out)
+        self.assertEqual(Job.objects.filter(status=Job.SUCCEEDED).count(), 5)
+        self.assertIn("Processed 5 job(s)", out.getvalue())
+
+    def test_sigterm_requeues_running_jobs(self):
+        job_started.clear()
+        job_may_finish.clear()
+        self.addCleanup(job_may_finish.set)
+        job = jobs.enqueue("test_block")
+
+        def terminate():
+            if job_started.wait(10):
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        threading.Thread(target=terminate, daemon=True).start()
+        out = StringIO()
+        call_command("process_jobs", "--workers", "1", "--grace-period", "0.1", stdout=out)
+        self.assertIn("Re-queued 1 unfinished job(s)", out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 0))
+
+        # The abandoned worker finishing later leaves the queued job alone.
+        with self.assertLogs("medtrackerapp.jobs", level="WARNING"):
+            job_may_finish.set()
+            for thread in threading.enumerate():
+                if thread.name.startswith("job-worker"):
+                    thread.join(5)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+
+class WarmDrugInfoJobTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @patch("medtrackerapp.models.DrugInfoService.get_drug_info")
+    def test_create_medication_warms_drug_info(self, mock_get_info):
+        mock_get_info.return_value = {"name": "IBUPROFEN"}
+        response = self.client.post(
+            reverse("medication-list"),
+            {"name": "Ibuprofen", "dosage_mg": 200, "prescribed_per_day": 3},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_get_info.assert_not_called()
+
+        jobs.run_pending()
+        mock_get_info.assert_called_once_with("Ibuprofen")
+        self.assertEqual(cache.get(DrugInfoService.cache_key("Ibuprofen")), {"name": "IBUPROFEN"})
+
+        # The info endpoint is now answered from the cache
+        response = self.client.get(reverse("medication-get-external-info", args=[response.data["id"]]))
+        self.assertEqual(response.data, {"name": "IBUPROFEN"})
+        mock_get_info.assert_called_once()
+
+
+class ExportJobTests(APITestCase):
+
+    def setUp(self):
+        self.export_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        override = override_settings(EXPORT_ROOT=self.export_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = get_user_model().objects.create_user("alice")
+        self.med = Medication.objects.create(owner=self.user, name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        now = timezone.now()
+        DoseLog.objects.create(medication=self.med, taken_at=now - timedelta(days=10))
+        DoseLog.objects.create(medication=self.med, taken_at=now, was_taken=False)
+        self.client.force_authenticate(self.user)
+
+    def test_export_lifecycle(self):
+        response = self.client.post(reverse("doselog-export"))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_url = response.data["url"]
+
+        self.assertEqual(self.client.get(job_url).data["status"], Job.QUEUED)
+        download_url = reverse("job-download", args=[response.data["job"]])
+        self.assertEqual(self.client.get(download_url).status_code, status.HTTP_409_CONFLICT)
+
+        jobs.run_pending()
+        job = self.client.get(job_url).data
+        self.assertEqual(job["status"], Job.SUCCEEDED)
+        self.assertEqual(job["result"]["rows"], 2)
+
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], ["id", "medication_id", "medication", "taken_at", "was_taken"])
+        self.assertEqual(len(rows), 3)
+
+    def test_export_date_range(self):
+        today = timezone.now().date()
+        self.client.post(reverse("doselog-export"), {"start": today, "end": today}, format="json")
+        jobs.run_pending()
+        self.assertEqual(Job.objects.get().result["rows"], 1)
+
+    def test_export_invalid_dates(self):
+        response = self.client.post(reverse("doselog-export"), {"start": "2025-01-01"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_rejects_non_object_body(self):
+        response = self.client.post(reverse("doselog-export"), [{"start": "2025-01-01"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Job.objects.exists())
+
+    def test_jobs_are_scoped_to_owner(self):
+        response = self.client.post(reverse("doselog-export"))
+        self.client.force_authenticate(get_user_model().objects.create_user("bob"))
+        response = self.client.get(response.data["url"])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
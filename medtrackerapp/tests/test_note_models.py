@@ -25,3 +25,10 @@ class NoteModelTests(TestCase):
         notes = Note.objects.all()
         self.assertEqual(notes[0], note2)  # Most recent first
         self.assertEqual(notes[1], note1)
+
+    def test_search_matches_all_terms(self):
+        Note.objects.create(medication=self.med, text="Take with food in the morning")
+        Note.objects.create(medication=self.med, text="Skipped food today")
+        Note.objects.create(medication=self.med, text="Morning headache")
+        results = Note.objects.search("food morning")
+        self.assertEqual([note.text for note in results], ["Take with food in the morning"])
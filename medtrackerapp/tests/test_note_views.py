@@ -74,3 +74,67 @@ class NoteViewTests(APITestCase):
         response = self.client.patch(url, data, format="json")
         
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_list_notes_expand_medication(self):
+        Note.objects.create(medication=self.med, text="First note")
+        url = reverse("note-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"expand": "medication"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["medication"], {
+            "id": self.med.id,
+            "name": "Aspirin",
+            "dosage_mg": 100,
+        })
+
+    def test_retrieve_note_sparse_fields(self):
+        note = Note.objects.create(medication=self.med, text="Test note")
+        url = reverse("note-detail", args=[note.id])
+        response = self.client.get(url, {"fields": "text"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"text": "Test note"})
+
+
+class NoteSearchViewTests(APITestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.other = Medication.objects.create(name="Ibuprofen", dosage_mg=200, prescribed_per_day=3)
+        Note.objects.create(medication=self.med, text="Take with food")
+        Note.objects.create(medication=self.med, text="Caused a mild headache")
+        Note.objects.create(medication=self.other, text="Food helps with stomach upset")
+        self.url = reverse("note-search")
+
+    def test_search_returns_matching_notes(self):
+        response = self.client.get(self.url, {"q": "food"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        for note in response.data["results"]:
+            self.assertIn("food", note["text"].lower())
+
+    def test_search_filtered_by_medication(self):
+        response = self.client.get(self.url, {"q": "food", "medication": self.other.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["medication"], self.other.id)
+
+    def test_search_is_paginated(self):
+        response = self.client.get(self.url, {"q": "food", "page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_search_no_matches(self):
+        response = self.client.get(self.url, {"q": "dizziness"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_search_missing_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+    def test_search_invalid_medication(self):
+        response = self.client.get(self.url, {"q": "food", "medication": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
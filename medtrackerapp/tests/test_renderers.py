@@ -0,0 +1,119 @@
+import gzip
+from unittest import skipUnless
+
+import msgpack
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from medtrackerapp.middleware import accepted_encodings, brotli, compress_brotli
+from medtrackerapp.models import DoseLog, Medication
+from medtrackerapp.renderers import to_columns
+
+
+class DoseLogFormatTests(APITestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now(), was_taken=True)
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now(), was_taken=False)
+        self.url = reverse("doselog-list")
+
+    def test_list_as_msgpack(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        logs = msgpack.unpackb(response.content)
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(set(logs[0]), {"id", "medication", "taken_at", "was_taken"})
+
+    def test_filter_as_columnar_json(self):
+        today = timezone.now().date()
+        response = self.client.get(
+            reverse("doselog-filter-by-date"),
+            {"start": today, "end": today},
+            HTTP_ACCEPT="application/vnd.medtracker.columnar+json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["count"], 2)
+        self.assertEqual(sorted(body["columns"]["was_taken"]), [False, True])
+        self.assertEqual(body["columns"]["medication"], [self.med.id, self.med.id])
+
+    def test_columnar_error_stays_plain(self):
+        response = self.client.get(
+            reverse("doselog-filter-by-date"), HTTP_ACCEPT="application/vnd.medtracker.columnar+json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.json())
+
+    def test_create_from_msgpack(self):
+        body = msgpack.packb({
+            "medication": self.med.id,
+            "taken_at": timezone.now().isoformat(),
+            "was_taken": True,
+        })
+        response = self.client.post(
+            self.url, body, content_type="application/msgpack", HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(response.content)["medication"], self.med.id)
+
+    def test_invalid_msgpack_body(self):
+        response = self.client.post(self.url, b"\xc1", content_type="application/msgpack")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_to_columns_empty(self):
+        self.assertEqual(to_columns([]), {"count": 0, "columns": {}})
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        DoseLog.objects.bulk_create(
+            DoseLog(medication=med, taken_at=timezone.now()) for _ in range(50)
+        )
+        self.url = reverse("doselog-list")
+
+    def test_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertGreater(len(gzip.decompress(response.content)), len(response.content))
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_preferred(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertTrue(brotli.decompress(response.content).startswith(b"["))
+
+    def test_gzip_is_padded(self):
+        lengths = {len(self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip").content) for _ in range(10)}
+        self.assertGreater(len(lengths), 1)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_is_padded(self):
+        data = b"medication " * 200
+        outputs = [compress_brotli(data, quality=5, max_random_bytes=100) for _ in range(10)]
+        self.assertGreater(len({len(output) for output in outputs}), 1)
+        for output in outputs:
+            self.assertEqual(brotli.decompress(output), data)
+
+    def test_no_accept_encoding(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse("medication-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class AcceptEncodingTests(TestCase):
+
+    def test_parse(self):
+        self.assertEqual(accepted_encodings("gzip, deflate;q=0.5, br;q=0"), {"gzip", "deflate"})
+        self.assertEqual(accepted_encodings(""), set())
@@ -0,0 +1,134 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from medtrackerapp.models import DoseLog, Medication
+from medtrackerapp.schedule import missed_doses_report, missed_slots, slot_offsets
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+
+
+def at(day, hour, minute=0):
+    return datetime(2025, 3, day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+class SlotMatchingTests(TestCase):
+
+    def test_slot_offsets_spread_evenly(self):
+        self.assertEqual(slot_offsets(1), [12 * HOUR])
+        self.assertEqual(slot_offsets(2), [6 * HOUR, 18 * HOUR])
+        self.assertEqual(slot_offsets(3), [4 * HOUR, 12 * HOUR, 20 * HOUR])
+
+    def test_all_slots_taken(self):
+        taken = [6 * HOUR, 18 * HOUR + 600, DAY + 5 * HOUR, DAY + 19 * HOUR]
+        self.assertEqual(missed_slots(2, 0, 2, taken, 3 * HOUR), (4, []))
+
+    def test_dose_outside_tolerance_is_missed(self):
+        taken = [6 * HOUR, 22 * HOUR]
+        self.assertEqual(missed_slots(2, 0, 1, taken, 3 * HOUR), (2, [18 * HOUR]))
+
+    def test_one_dose_covers_only_one_slot(self):
+        # A dose at noon falls inside both windows but fills only the first slot
+        self.assertEqual(missed_slots(2, 0, 1, [12 * HOUR], 6 * HOUR), (2, [18 * HOUR]))
+
+    def test_no_schedule(self):
+        self.assertEqual(missed_slots(0, 0, 5, [], 0), (0, []))
+
+
+class MissedDosesReportTests(TestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+
+    def test_report(self):
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 6, 30))
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 18), was_taken=False)
+        DoseLog.objects.create(medication=self.med, taken_at=at(2, 7))
+        DoseLog.objects.create(medication=self.med, taken_at=at(2, 17))
+
+        report = missed_doses_report([self.med], date(2025, 3, 1), date(2025, 3, 2))
+        self.assertEqual(report, [{
+            "medication_id": self.med.id,
+            "expected": 4,
+            "taken": 3,
+            "missed_count": 1,
+            "missed": [at(1, 18)],
+        }])
+
+    def test_tolerance_override(self):
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 8))
+        report = missed_doses_report([self.med], date(2025, 3, 1), date(2025, 3, 1), tolerance_minutes=60)
+        self.assertEqual(report[0]["missed"], [at(1, 6), at(1, 18)])
+
+    def test_late_dose_just_after_period_counts(self):
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 6))
+        DoseLog.objects.create(medication=self.med, taken_at=at(2, 1, 30))
+        report = missed_doses_report([self.med], date(2025, 3, 1), date(2025, 3, 1), tolerance_minutes=480)
+        self.assertEqual(report[0]["missed_count"], 0)
+
+    def test_bulk_uses_one_log_query(self):
+        meds = [self.med] + [
+            Medication.objects.create(name=f"Med {i}", dosage_mg=10, prescribed_per_day=3) for i in range(5)
+        ]
+        for med in meds:
+            DoseLog.objects.create(medication=med, taken_at=at(1, 12))
+        with self.assertNumQueries(1):
+            report = missed_doses_report(meds, date(2025, 3, 1), date(2025, 3, 1))
+        self.assertEqual(len(report), 6)
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            missed_doses_report([self.med], date(2025, 3, 2), date(2025, 3, 1))
+
+    def test_invalid_tolerance(self):
+        with self.assertRaises(ValueError):
+            missed_doses_report([self.med], date(2025, 3, 1), date(2025, 3, 1), tolerance_minutes=24 * 60 + 1)
+
+    def test_report_keeps_medication_order(self):
+        other = Medication.objects.create(name="Other", dosage_mg=10, prescribed_per_day=1)
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 6))
+        report = missed_doses_report([other, self.med], date(2025, 3, 1), date(2025, 3, 1))
+        self.assertEqual([r["medication_id"] for r in report], [other.id, self.med.id])
+        self.assertEqual([r["missed_count"] for r in report], [1, 1])
+
+
+class MissedDosesViewTests(APITestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=1)
+        DoseLog.objects.create(medication=self.med, taken_at=at(1, 12))
+
+    def test_missed_for_medication(self):
+        url = reverse("medication-missed-doses", args=[self.med.id])
+        response = self.client.get(url, {"start": "2025-03-01", "end": "2025-03-03"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["expected"], 3)
+        self.assertEqual(response.data["missed"], [at(2, 12), at(3, 12)])
+
+    def test_missed_bulk(self):
+        Medication.objects.create(name="Other", dosage_mg=10, prescribed_per_day=2)
+        url = reverse("medication-missed-doses-bulk")
+        response = self.client.get(url, {"start": "2025-03-01", "end": "2025-03-01"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {r["medication_id"]: r["missed_count"] for r in response.data["medications"]}
+        self.assertEqual(counts[self.med.id], 0)
+        self.assertEqual(len(counts), 2)
+
+    def test_missed_invalid_params(self):
+        url = reverse("medication-missed-doses", args=[self.med.id])
+        for params in ({}, {"start": "2025-03-02", "end": "2025-03-01"},
+                       {"start": "2025-03-01", "end": "2025-03-02", "tolerance": "-5"},
+                       {"start": "2025-03-01", "end": "2025-03-02", "tolerance": "99999999999999"},
+                       {"start": "2025-01-01", "end": "9999-12-31"}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missed_at_end_of_calendar(self):
+        url = reverse("medication-missed-doses", args=[self.med.id])
+        response = self.client.get(url, {"start": "9999-12-30", "end": "9999-12-31", "tolerance": "1440"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["missed_count"], 2)
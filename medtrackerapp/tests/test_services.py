@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+from django.conf import settings
 from django.test import TestCase
 from unittest.mock import patch, Mock
 from medtrackerapp.services import DrugInfoService
@@ -70,3 +74,19 @@ class DrugInfoServiceTests(TestCase):
         with self.assertRaises(ValueError) as context:
             DrugInfoService.get_drug_info("")
         self.assertEqual(str(context.exception), "drug_name is required")
+
+
+class LazyImportTests(TestCase):
+
+    def test_app_startup_does_not_import_http_stack(self):
+        code = (
+            "import sys, django; django.setup(); "
+            "import medtrackerapp.models, medtrackerapp.tasks; "
+            "print('requests' in sys.modules)"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
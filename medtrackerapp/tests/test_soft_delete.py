@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp import jobs
+from medtrackerapp.models import DoseLog, Job, Medication, Note, Tombstone
+from medtrackerapp.tasks import purge_medication
+
+
+class MedicationSoftDeleteTests(APITestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        DoseLog.objects.bulk_create(
+            DoseLog(medication=self.med, taken_at=timezone.now()) for _ in range(5)
+        )
+        Note.objects.create(medication=self.med, text="Take with food")
+        self.url = reverse("medication-detail", args=[self.med.id])
+
+    def delete(self, url=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(url or self.url)
+
+    def test_delete_hides_medication_and_history(self):
+        response = self.delete()
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Medication.objects.filter(pk=self.med.pk).exists())
+        self.assertTrue(Medication.all_objects.filter(pk=self.med.pk).exists())
+        self.assertEqual(self.client.get(reverse("doselog-list")).data, [])
+        self.assertEqual(self.client.get(reverse("note-list")).data, [])
+        suggestions = self.client.get(reverse("medication-suggest"), {"prefix": "asp"}).data
+        self.assertEqual(suggestions, [])
+        self.assertEqual(
+            list(Tombstone.objects.values_list("kind", "object_id")),
+            [(Tombstone.MEDICATION, self.med.pk)],
+        )
+        self.assertTrue(Job.objects.filter(name="purge_medication", status=Job.QUEUED).exists())
+
+    def test_delete_cost_does_not_depend_on_history(self):
+        empty = Medication.objects.create(name="Empty", dosage_mg=10, prescribed_per_day=1)
+        with CaptureQueriesContext(connection) as small:
+            self.delete(reverse("medication-detail", args=[empty.id]))
+        with CaptureQueriesContext(connection) as large:
+            self.delete()
+        self.assertEqual(len(large), len(small))
+
+    @override_settings(PURGE_BATCH_SIZE=2)
+    def test_purge_job_removes_history_in_batches(self):
+        self.delete()
+        self.assertEqual(jobs.run_pending(), 1)
+        job = Job.objects.get(name="purge_medication")
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {"medication_id": self.med.pk, "logs": 5, "notes": 1})
+        self.assertFalse(Medication.all_objects.filter(pk=self.med.pk).exists())
+        self.assertFalse(DoseLog.objects.exists())
+        self.assertFalse(Note.objects.exists())
+        self.assertEqual(Tombstone.objects.count(), 1)
+
+    def test_stale_update_does_not_undelete(self):
+        stale = Medication.objects.get(pk=self.med.pk)
+        self.delete()
+        stale.name = "Aspirin EC"
+        stale.save()
+        self.assertFalse(Medication.objects.filter(pk=self.med.pk).exists())
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(Job.objects.get(name="purge_medication").status, Job.SUCCEEDED)
+
+    def test_purge_refuses_live_medication(self):
+        with self.assertRaises(ValueError):
+            purge_medication(None, self.med.pk)
+        self.assertEqual(DoseLog.objects.count(), 5)
@@ -0,0 +1,177 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp.models import (
+    Medication, DoseLog, Note, Tombstone, reserve_change_seqs, safe_change_seq,
+)
+
+
+class ChangeTrackingTests(TestCase):
+
+    def setUp(self):
+        self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+
+    def test_every_save_takes_a_higher_seq(self):
+        log = DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        first = log.change_seq
+        log.was_taken = False
+        log.save(update_fields=["was_taken"])
+        log.refresh_from_db()
+        self.assertGreater(first, self.med.change_seq)
+        self.assertGreater(log.change_seq, first)
+
+    def test_bulk_create_assigns_distinct_seqs(self):
+        logs = DoseLog.objects.bulk_create(
+            DoseLog(medication=self.med, taken_at=timezone.now()) for _ in range(3)
+        )
+        seqs = [log.change_seq for log in logs]
+        self.assertEqual(seqs, sorted(set(seqs)))
+        self.assertGreater(seqs[0], self.med.change_seq)
+
+    def test_bulk_update_assigns_new_distinct_seqs(self):
+        DoseLog.objects.bulk_create(
+            DoseLog(medication=self.med, taken_at=timezone.now()) for _ in range(3)
+        )
+        before = max(DoseLog.objects.values_list("change_seq", flat=True))
+        self.assertEqual(DoseLog.objects.update(was_taken=False), 3)
+        seqs = sorted(DoseLog.objects.values_list("change_seq", flat=True))
+        self.assertEqual(len(set(seqs)), 3)
+        self.assertGreater(seqs[0], before)
+
+    def test_reserve_change_seqs_is_contiguous(self):
+        block = reserve_change_seqs(4)
+        self.assertEqual(block, list(range(block[0], block[0] + 4)))
+        self.assertEqual(reserve_change_seqs(0), [])
+
+    def test_safe_point_is_only_needed_on_postgresql(self):
+        # The SyncCounter row lock serializes allocation with commit.
+        self.assertIsNone(safe_change_seq())
+
+    def test_delete_records_tombstone(self):
+        note = Note.objects.create(medication=self.med, text="Take with food")
+        note_id = note.id
+        note.delete()
+        tombstone = Tombstone.objects.get()
+        self.assertEqual((tombstone.kind, tombstone.object_id), (Tombstone.NOTE, note_id))
+        self.assertGreater(tombstone.change_seq, self.med.change_seq)
+
+    def test_cascaded_children_get_no_tombstones(self):
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        Note.objects.create(medication=self.med, text="Take with food")
+        med_id = self.med.id
+        self.med.delete()
+        self.assertEqual(
+            list(Tombstone.objects.values_list("kind", "object_id")),
+            [(Tombstone.MEDICATION, med_id)],
+        )
+
+
+class SyncViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("alice")
+        self.client.force_authenticate(self.user)
+        self.med = Medication.objects.create(
+            owner=self.user, name="Aspirin", dosage_mg=100, prescribed_per_day=2
+        )
+        self.log = DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        self.note = Note.objects.create(medication=self.med, text="Take with food")
+        self.url = reverse("sync-list")
+
+    def test_full_sync_returns_everything(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m["id"] for m in response.data["medications"]], [self.med.id])
+        self.assertEqual([l["id"] for l in response.data["logs"]], [self.log.id])
+        self.assertEqual([n["id"] for n in response.data["notes"]], [self.note.id])
+        self.assertEqual(response.data["token"], Note.objects.get().change_seq)
+        self.assertFalse(response.data["has_more"])
+
+    def test_delta_returns_only_changes_and_deletions(self):
+        token = self.client.get(self.url).data["token"]
+        self.log.was_taken = False
+        self.log.save()
+        note_id = self.note.id
+        self.note.delete()
+
+        response = self.client.get(self.url, {"since": token})
+        # The toggle changed the medication's adherence as well.
+        self.assertEqual([m["adherence"] for m in response.data["medications"]], [0.0])
+        self.assertEqual([l["id"] for l in response.data["logs"]], [self.log.id])
+        self.assertFalse(response.data["logs"][0]["was_taken"])
+        self.assertEqual(response.data["deleted"], {"medications": [], "logs": [], "notes": [note_id]})
+
+        response = self.client.get(self.url, {"since": response.data["token"]})
+        self.assertEqual(response.data["logs"], [])
+        self.assertEqual(response.data["deleted"]["notes"], [])
+
+    def test_unchanged_sync_keeps_token(self):
+        token = self.client.get(self.url).data["token"]
+        response = self.client.get(self.url, {"since": token})
+        self.assertEqual(response.data["token"], token)
+        self.assertEqual(response.data["logs"], [])
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_paging_does_not_skip_changes(self):
+        for _ in range(4):
+            DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        Note.objects.create(medication=self.med, text="Later note")
+
+        seen_logs, seen_notes, token, pages = set(), set(), 0, 0
+        while True:
+            data = self.client.get(self.url, {"since": token}).data
+            self.assertLessEqual(len(data["logs"]), 2)
+            seen_logs.update(l["id"] for l in data["logs"])
+            seen_notes.update(n["id"] for n in data["notes"])
+            token, pages = data["token"], pages + 1
+            if not data["has_more"]:
+                break
+        self.assertEqual(seen_logs, set(DoseLog.objects.values_list("id", flat=True)))
+        self.assertEqual(seen_notes, set(Note.objects.values_list("id", flat=True)))
+        self.assertGreater(pages, 1)
+
+    def test_changes_past_safe_point_wait_for_next_sync(self):
+        # A transaction holding the note's sequence value is still open.
+        with patch("medtrackerapp.views.safe_change_seq", return_value=self.note.change_seq - 1):
+            data = self.client.get(self.url).data
+        self.assertEqual([m["id"] for m in data["medications"]], [self.med.id])
+        self.assertEqual([l["id"] for l in data["logs"]], [self.log.id])
+        self.assertEqual(data["notes"], [])
+        self.med.refresh_from_db()
+        self.assertEqual(data["token"], max(self.med.change_seq, self.log.change_seq))
+
+        data = self.client.get(self.url, {"since": data["token"]}).data
+        self.assertEqual((data["medications"], data["logs"]), ([], []))
+        self.assertEqual([n["id"] for n in data["notes"]], [self.note.id])
+
+    def test_sync_is_scoped_to_user(self):
+        other = get_user_model().objects.create_user("bob")
+        other_med = Medication.objects.create(
+            owner=other, name="Atenolol", dosage_mg=50, prescribed_per_day=1
+        )
+        other_med.delete()
+        response = self.client.get(self.url)
+        self.assertEqual([m["id"] for m in response.data["medications"]], [self.med.id])
+        self.assertEqual(response.data["deleted"]["medications"], [])
+
+    def test_invalid_since_returns_400(self):
+        for value in ("abc", "-1"):
+            response = self.client.get(self.url, {"since": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
+
+    def test_deleting_owner_removes_data_without_tombstones(self):
+        user = get_user_model().objects.create_user("carol")
+        med = Medication.objects.create(owner=user, name="Atenolol", dosage_mg=50, prescribed_per_day=1)
+        DoseLog.objects.create(medication=med, taken_at=timezone.now())
+        Note.objects.create(medication=med, text="Morning")
+        Note.objects.create(medication=med, text="Evening").delete()
+
+        user.delete()
+        self.assertFalse(Medication.all_objects.filter(owner_id=user.pk).exists())
+        self.assertFalse(Tombstone.objects.filter(owner_id=user.pk).exists())
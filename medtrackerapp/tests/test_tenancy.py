@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp.autocomplete import medication_names
+from medtrackerapp.models import Medication, DoseLog, Note
+
+
+class OwnerScopingTests(APITestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.alice = User.objects.create_user("alice")
+        self.bob = User.objects.create_user("bob")
+        self.alice_med = Medication.objects.create(
+            owner=self.alice, name="Aspirin", dosage_mg=100, prescribed_per_day=2
+        )
+        self.bob_med = Medication.objects.create(
+            owner=self.bob, name="Atenolol", dosage_mg=50, prescribed_per_day=1
+        )
+        self.shared_med = Medication.objects.create(name="Ibuprofen", dosage_mg=200, prescribed_per_day=3)
+        DoseLog.objects.create(medication=self.alice_med, taken_at=timezone.now())
+        DoseLog.objects.create(medication=self.bob_med, taken_at=timezone.now())
+        Note.objects.create(medication=self.bob_med, text="Bob's note")
+
+    def test_children_inherit_owner(self):
+        log = DoseLog.objects.create(medication=self.bob_med, taken_at=timezone.now())
+        note = Note.objects.create(medication=self.alice_med, text="Take with food")
+        self.assertEqual(log.owner, self.bob)
+        self.assertEqual(note.owner, self.alice)
+
+    def test_lists_are_scoped_to_user(self):
+        self.client.force_authenticate(self.alice)
+        meds = self.client.get(reverse("medication-list")).data
+        logs = self.client.get(reverse("doselog-list")).data
+        notes = self.client.get(reverse("note-list")).data
+        self.assertEqual([m["id"] for m in meds], [self.alice_med.id])
+        self.assertEqual([l["medication"] for l in logs], [self.alice_med.id])
+        self.assertEqual(notes, [])
+
+    def test_anonymous_sees_only_unowned_rows(self):
+        meds = self.client.get(reverse("medication-list")).data
+        self.assertEqual([m["id"] for m in meds], [self.shared_med.id])
+        self.assertEqual(self.client.get(reverse("doselog-list")).data, [])
+
+    def test_cannot_retrieve_other_users_medication(self):
+        self.client.force_authenticate(self.alice)
+        response = self.client.get(reverse("medication-detail", args=[self.bob_med.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_assigns_owner(self):
+        self.client.force_authenticate(self.alice)
+        response = self.client.post(
+            reverse("medication-list"),
+            {"name": "Metformin", "dosage_mg": 500, "prescribed_per_day": 2},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Medication.objects.get(pk=response.data["id"]).owner, self.alice)
+
+        response = self.client.post(
+            reverse("doselog-list"),
+            {"medication": self.alice_med.id, "taken_at": timezone.now()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DoseLog.objects.get(pk=response.data["id"]).owner, self.alice)
+
+    def test_cannot_log_against_other_users_medication(self):
+        self.client.force_authenticate(self.alice)
+        response = self.client.post(
+            reverse("doselog-list"),
+            {"medication": self.bob_med.id, "taken_at": timezone.now()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            reverse("note-list"),
+            {"medication": self.bob_med.id, "text": "Sneaky"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_suggest_is_scoped_to_user(self):
+        medication_names.invalidate()
+        self.addCleanup(medication_names.invalidate)
+        self.client.force_authenticate(self.alice)
+        response = self.client.get(reverse("medication-suggest"), {"prefix": "a"})
+        self.assertEqual([s["name"] for s in response.data], ["Aspirin"])
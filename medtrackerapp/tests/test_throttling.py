@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+from medtrackerapp.models import Medication
+from medtrackerapp.throttling import MemoryBucketStore, bucket_stores, in_flight, take_token
+
+TIGHT_LIMITS = {
+    "read": {"rate": 100, "burst": 100},
+    "analytics": {"rate": 0.01, "burst": 2},
+}
+
+
+class TakeTokenTests(SimpleTestCase):
+
+    def test_burst_then_refill(self):
+        state = None
+        for _ in range(3):
+            state, wait = take_token(state, rate=2, burst=3, now=0.0)
+            self.assertEqual(wait, 0)
+        state, wait = take_token(state, rate=2, burst=3, now=0.0)
+        self.assertAlmostEqual(wait, 0.5)
+        state, wait = take_token(state, rate=2, burst=3, now=0.5)
+        self.assertEqual(wait, 0)
+
+    def test_refill_is_capped_at_burst(self):
+        state, _ = take_token(None, rate=1, burst=2, now=0.0)
+        state, _ = take_token(state, rate=1, burst=2, now=1000.0)
+        self.assertEqual(state, (1, 1000.0))
+
+
+class MemoryBucketStoreTests(SimpleTestCase):
+
+    def consume(self, store, key, rate, burst, now):
+        with patch("medtrackerapp.throttling.time.monotonic", return_value=now):
+            return store.consume(key, rate, burst)
+
+    def test_pruning_keeps_other_scopes_partly_drained_buckets(self):
+        store = MemoryBucketStore(max_keys=4)
+        # A slow scope: the bucket needs 100s per token to refill.
+        self.consume(store, "analytics:a", rate=0.01, burst=2, now=0.0)
+        self.consume(store, "analytics:a", rate=0.01, burst=2, now=0.0)
+        # Fast-scope buckets are full again a moment later.
+        for key in ("read:b", "read:c", "read:d"):
+            self.consume(store, key, rate=100, burst=100, now=0.0)
+        self.consume(store, "read:e", rate=100, burst=100, now=1.0)
+        self.assertEqual(list(store._buckets), ["analytics:a", "read:e"])
+        self.assertGreater(self.consume(store, "analytics:a", rate=0.01, burst=2, now=1.0), 0)
+
+    def test_least_recently_used_buckets_are_evicted_when_crowded(self):
+        store = MemoryBucketStore(max_keys=4)
+        for key in "abcde":
+            self.consume(store, key, rate=0.01, burst=2, now=0.0)
+        self.assertEqual(list(store._buckets), ["d", "e"])
+
+
+@override_settings(RATE_LIMITS=TIGHT_LIMITS)
+class RateLimitViewTests(APITestCase):
+
+    def setUp(self):
+        bucket_stores["memory"].reset()
+        cache.clear()
+        self.filter_url = reverse("doselog-filter-by-date")
+        self.params = {"start": "2025-01-01", "end": "2025-01-31"}
+
+    def test_analytics_burst_is_limited_with_retry_after(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(self.filter_url, self.params).status_code, 200)
+        response = self.client.get(self.filter_url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        # Cheap reads have their own bucket.
+        self.assertEqual(self.client.get(reverse("doselog-list")).status_code, 200)
+
+    def test_buckets_are_per_client(self):
+        for _ in range(3):
+            self.client.get(self.filter_url, self.params)
+        self.client.force_authenticate(get_user_model().objects.create_user("alice"))
+        self.assertEqual(self.client.get(self.filter_url, self.params).status_code, 200)
+
+    @override_settings(RATE_LIMIT_BACKEND="cache")
+    def test_cache_backend(self):
+        statuses = [self.client.get(self.filter_url, self.params).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @override_settings(RATE_LIMITS={})
+    def test_unconfigured_scope_is_not_limited(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.filter_url, self.params).status_code, 200)
+
+
+@override_settings(CONCURRENCY_LIMITS={"analytics": 1}, CONCURRENCY_RETRY_AFTER=2)
+class ConcurrencyLimitTests(APITestCase):
+
+    def setUp(self):
+        bucket_stores["memory"].reset()
+        med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
+        self.missed_url = reverse("medication-missed-doses", args=[med.id])
+        self.params = {"start": "2025-01-01", "end": "2025-01-02"}
+
+    def test_sheds_load_when_saturated(self):
+        self.assertTrue(in_flight.acquire("analytics", 1))
+        try:
+            response = self.client.get(self.missed_url, self.params)
+        finally:
+            in_flight.release("analytics")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "2")
+        # Other endpoint classes are not affected.
+        self.assertEqual(self.client.get(reverse("medication-list")).status_code, 200)
+
+    def test_dashboard_is_admission_controlled(self):
+        self.assertTrue(in_flight.acquire("analytics", 1))
+        try:
+            response = self.client.get(reverse("dashboard-list"))
+        finally:
+            in_flight.release("analytics")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_slot_is_released_after_response(self):
+        self.assertEqual(self.client.get(self.missed_url, self.params).status_code, 200)
+        self.assertEqual(self.client.get(self.missed_url, {"start": "bad"}).status_code, 400)
+        self.assertEqual(in_flight.in_flight("analytics"), 0)
@@ -5,10 +5,12 @@ from rest_framework import status
 from unittest.mock import patch
 from django.utils import timezone
 from datetime import timedelta
+from django.core.cache import cache
 
 
 class MedicationViewTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.med = Medication.objects.create(name="Aspirin", dosage_mg=100, prescribed_per_day=2)
 
     def test_list_medications_valid_data(self):
@@ -146,3 +148,59 @@ class DoseLogViewTests(APITestCase):
         url = reverse("doselog-filter-by-date")
         response = self.client.get(url, {"start": "invalid-date", "end": "2023-10-10"})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_logs_open_ended_range(self):
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        url = reverse("doselog-filter-by-date")
+        response = self.client.get(url, {"start": "0001-01-01", "end": "9999-12-31"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_list_logs_expand_medication(self):
+        other = Medication.objects.create(name="Other Med", dosage_mg=20, prescribed_per_day=1)
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        DoseLog.objects.create(medication=other, taken_at=timezone.now())
+
+        # Medications are joined in, so the list costs a single query
+        with self.assertNumQueries(1):
+            response = self.client.get(self.log_url, {"expand": "medication"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = {log["medication"]["name"] for log in response.data}
+        self.assertEqual(names, {"Test Med", "Other Med"})
+        self.assertEqual(set(response.data[0]["medication"]), {"id", "name", "dosage_mg"})
+
+    def test_list_logs_sparse_fields(self):
+        DoseLog.objects.create(medication=self.med, taken_at=timezone.now())
+        response = self.client.get(self.log_url, {"fields": "id,was_taken"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "was_taken"})
+
+    def test_filter_logs_sparse_fields_with_expand(self):
+        now = timezone.now()
+        DoseLog.objects.create(medication=self.med, taken_at=now)
+        url = reverse("doselog-filter-by-date")
+        response = self.client.get(url, {
+            "start": now.date(),
+            "end": now.date(),
+            "fields": "taken_at,medication",
+            "expand": "medication",
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"taken_at", "medication"})
+        self.assertEqual(response.data[0]["medication"]["dosage_mg"], 50)
+
+    def test_list_logs_unknown_field(self):
+        response = self.client.get(self.log_url, {"fields": "id,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+    def test_list_logs_unknown_expansion(self):
+        response = self.client.get(self.log_url, {"expand": "owner"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_log_ignores_sparse_fields(self):
+        data = {"medication": self.med.id, "taken_at": timezone.now(), "was_taken": True}
+        response = self.client.post(f"{self.log_url}?fields=id", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("taken_at", response.data)
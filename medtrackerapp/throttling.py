@@ -0,0 +1,212 @@
+import itertools
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+
+def throttle_scope(request, view) -> str:
+    """
+    Return the endpoint class a request is rate limited under.
+
+    Views map action names to scopes in `throttle_scopes`; other
+    requests are "read" when safe and "write" otherwise.
+    """
+    scope = getattr(view, "throttle_scopes", {}).get(getattr(view, "action", None))
+    if scope:
+        return scope
+    return "read" if request.method in SAFE_METHODS else "write"
+
+
+def take_token(state, rate, burst, now):
+    """
+    Refill a token bucket up to `now` and try to take one token from it.
+
+    Args:
+        state (tuple[float, float] | None): `(tokens, updated)` as
+            previously returned, or None for a new (full) bucket.
+        rate (float): Tokens added per second.
+        burst (int): Bucket capacity.
+        now (float): Current time in seconds.
+
+    Returns:
+        tuple[tuple[float, float], float]: The new state and the number
+        of seconds to wait before a token is available (0 if one was taken).
+    """
+    tokens, updated = state if state is not None else (burst, now)
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Token buckets held in process memory.
+
+    Fast and exact, but each worker process enforces its limits
+    independently. Each bucket remembers when it will be full again,
+    which is when it can be forgotten without effect. Once more than
+    `max_keys` buckets are tracked, full buckets are dropped and, if
+    that is not enough, the least recently used ones, down to half of
+    `max_keys`; pruning therefore runs rarely and costs O(1) amortized.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> ((tokens, updated), full_at), least recently used first.
+        self._buckets = {}
+
+    def consume(self, key, rate, burst) -> float:
+        """Take a token from `key`'s bucket; return the seconds to wait if empty."""
+        now = time.monotonic()
+        with self._lock:
+            state, _ = self._buckets.pop(key, (None, None))
+            state, wait = take_token(state, rate, burst, now)
+            self._buckets[key] = (state, now + (burst - state[0]) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return wait
+
+    def _prune(self, now):
+        buckets = {key: entry for key, entry in self._buckets.items() if entry[1] > now}
+        keep = self.max_keys // 2
+        if len(buckets) > keep:
+            buckets = dict(itertools.islice(buckets.items(), len(buckets) - keep, None))
+        self._buckets = buckets
+
+    def reset(self):
+        with self._lock:
+            self._buckets = {}
+
+
+class CacheBucketStore:
+    """
+    Token buckets kept in a Django cache, shared by all processes.
+
+    Works with any cache backend, including `DatabaseCache` when no
+    dedicated cache server is available. Updates are read-modify-write
+    without a lock, so concurrent requests from one client may
+    occasionally both be admitted; limits hold approximately, which is
+    enough to stop a client from flooding the database.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def consume(self, key, rate, burst) -> float:
+        """Take a token from `key`'s bucket; return the seconds to wait if empty."""
+        cache = caches[self.alias]
+        cache_key = f"ratelimit:{key}"
+        state, wait = take_token(cache.get(cache_key), rate, burst, time.time())
+        # A bucket left alone this long is full again and need not be kept.
+        cache.set(cache_key, state, math.ceil(burst / rate) + 1)
+        return wait
+
+
+bucket_stores = {
+    "memory": MemoryBucketStore(),
+    "cache": CacheBucketStore(),
+}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per-client token bucket rate limit for each endpoint class.
+
+    The scope of a request comes from `throttle_scope()` and its limit
+    from `RATE_LIMITS[scope]`, a dict with a sustained `rate` (requests
+    per second) and a `burst` size. Clients are identified by user id,
+    or by address for anonymous requests. Buckets live in the store
+    selected by `RATE_LIMIT_BACKEND` ("memory" or "cache"). Rejected
+    requests get 429 Too Many Requests with a `Retry-After` header.
+    """
+
+    def allow_request(self, request, view):
+        scope = throttle_scope(request, view)
+        limit = settings.RATE_LIMITS.get(scope)
+        if not limit:
+            return True
+        user = request.user
+        if user is not None and user.is_authenticated:
+            ident = f"user:{user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        store = bucket_stores[settings.RATE_LIMIT_BACKEND]
+        self._wait = store.consume(f"{scope}:{ident}", limit["rate"], limit["burst"])
+        return self._wait == 0
+
+    def wait(self):
+        return self._wait
+
+
+class ServiceUnavailable(APIException):
+    """503 response that tells the client when to retry."""
+    status_code = 503
+    default_detail = "The server is busy. Please retry shortly."
+    default_code = "service_unavailable"
+
+    def __init__(self, wait, detail=None):
+        super().__init__(detail)
+        # DRF's exception handler turns this into a Retry-After header.
+        self.wait = wait
+
+
+class InFlightLimiter:
+    """Counts the requests of each scope currently being served by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def acquire(self, scope, limit) -> bool:
+        with self._lock:
+            if self._counts.get(scope, 0) >= limit:
+                return False
+            self._counts[scope] = self._counts.get(scope, 0) + 1
+            return True
+
+    def release(self, scope):
+        with self._lock:
+            self._counts[scope] -= 1
+
+    def in_flight(self, scope) -> int:
+        return self._counts.get(scope, 0)
+
+
+in_flight = InFlightLimiter()
+
+
+class ConcurrencyLimitMixin:
+    """
+    Sheds load when too many heavy requests are in flight.
+
+    Scopes listed in `CONCURRENCY_LIMITS` may have at most that many
+    requests running at once in each process; further requests are
+    rejected immediately with 503 Service Unavailable and a
+    `Retry-After` of `CONCURRENCY_RETRY_AFTER` seconds instead of
+    queueing on the database. The slot is taken after authentication
+    and rate limiting, so throttled requests never hold one.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        scope = throttle_scope(request, self)
+        limit = settings.CONCURRENCY_LIMITS.get(scope)
+        if limit:
+            if not in_flight.acquire(scope, limit):
+                raise ServiceUnavailable(wait=settings.CONCURRENCY_RETRY_AFTER)
+            self._in_flight_scope = scope
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        scope = getattr(self, "_in_flight_scope", None)
+        if scope is not None:
+            in_flight.release(scope)
+            self._in_flight_scope = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,13 +1,26 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import MedicationViewSet, DoseLogViewSet, NoteViewSet
+from .views import (
+    MedicationViewSet,
+    DoseLogViewSet,
+    NoteViewSet,
+    JobViewSet,
+    SyncViewSet,
+    DashboardViewSet,
+    dose_event_stream,
+)
 
 
 router = DefaultRouter()
 router.register("medications", MedicationViewSet, basename="medication")
 router.register("logs", DoseLogViewSet, basename="doselog")
 router.register("notes", NoteViewSet, basename="note")
+router.register("jobs", JobViewSet, basename="job")
+router.register("sync", SyncViewSet, basename="sync")
+router.register("dashboard", DashboardViewSet, basename="dashboard")
 
 urlpatterns = [
+    # Must precede the router, whose logs/{pk}/ route would also match.
+    path("logs/stream/", dose_event_stream, name="doselog-stream"),
     path("", include(router.urls)),
 ]
@@ -1,28 +1,315 @@
+from collections.abc import Mapping
+from datetime import timedelta
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.dateparse import parse_date
-from .models import Medication, DoseLog, Note
-from .serializers import MedicationSerializer, DoseLogSerializer, NoteSerializer
+from .autocomplete import medication_names
+from .events import event_stream
+from .jobs import enqueue
+from .renderers import ColumnarJSONRenderer, MessagePackParser, MessagePackRenderer
+from .models import Medication, DoseLog, Note, Job, Tombstone, day_range, safe_change_seq
+from .schedule import MAX_TOLERANCE_MINUTES, missed_doses_report
+from .throttling import ConcurrencyLimitMixin
+from .serializers import (
+    EXPANDED_MEDICATION_FIELDS,
+    DashboardMedicationSerializer,
+    MedicationSerializer,
+    DoseLogSerializer,
+    NoteSerializer,
+    JobSerializer,
+)
+
+
+class NoteSearchPagination(PageNumberPagination):
+    """Page-number pagination used for note search results."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class OwnerScopedMixin:
+    """
+    Scopes a viewset to the requesting user's rows.
+
+    Querysets are filtered with `for_owner()`, so each patient only
+    reads and modifies their own data, and new rows are saved with the
+    requesting user as owner. Anonymous requests work on unowned rows.
+    """
+
+    def get_owner(self):
+        """Return the owner for new rows, or None for anonymous requests."""
+        user = self.request.user
+        return user if user.is_authenticated else None
+
+    def get_queryset(self):
+        return super().get_queryset().for_owner(self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.get_owner())
+
+
+class MedicationExpansionMixin:
+    """
+    Adds `?expand=medication` and `?fields=` support to a viewset.
 
-class MedicationViewSet(viewsets.ModelViewSet):
+    Both parameters only apply to read requests. `expand=medication`
+    joins the medication with `select_related` and renders its name and
+    dosage inline, and `fields` restricts the serialized output to the
+    given comma-separated field names. Whenever either is used, the
+    queryset is narrowed with `.only()` so that the SELECT carries just
+    the columns needed for the response.
+    """
+
+    def _query_param_set(self, name):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return set()
+        raw = self.request.query_params.get(name, "")
+        return {part.strip() for part in raw.split(",") if part.strip()}
+
+    def get_requested_fields(self):
+        """
+        Return the validated `?fields=` selection, or None if absent.
+
+        Raises:
+            ValidationError: If an unknown field name is requested.
+        """
+        requested = self._query_param_set("fields")
+        if not requested:
+            return None
+        available = self.get_serializer_class().Meta.fields
+        unknown = requested - set(available)
+        if unknown:
+            raise ValidationError(
+                {"error": f"Unknown field(s) requested: {', '.join(sorted(unknown))}."}
+            )
+        return [name for name in available if name in requested]
+
+    def get_expansions(self):
+        """
+        Return the validated `?expand=` selection.
+
+        Raises:
+            ValidationError: If an unsupported relation is requested.
+        """
+        expand = self._query_param_set("expand")
+        unknown = expand - {"medication"}
+        if unknown:
+            raise ValidationError(
+                {"error": f"Cannot expand: {', '.join(sorted(unknown))}."}
+            )
+        return expand
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        expand = "medication" in self.get_expansions()
+        columns = requested or list(self.get_serializer_class().Meta.fields)
+
+        if expand and "medication" in columns:
+            queryset = queryset.select_related("medication")
+            columns = columns + [f"medication__{field}" for field in EXPANDED_MEDICATION_FIELDS]
+        elif not requested:
+            return queryset
+
+        return queryset.only(*columns)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        context["expand"] = self.get_expansions()
+        return context
+
+
+class MedicationViewSet(OwnerScopedMixin, ConcurrencyLimitMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing medications.
 
     Provides standard CRUD operations via the Django REST Framework
     `ModelViewSet`, as well as a custom action for retrieving
-    additional information from an external API (OpenFDA).
+    additional information from an external API (OpenFDA). Creating a
+    medication queues a background job that warms its drug info.
 
     Endpoints:
         - GET /medications/ — list all medications
         - POST /medications/ — create a new medication
         - GET /medications/{id}/ — retrieve a specific medication
         - PUT/PATCH /medications/{id}/ — update a medication
-        - DELETE /medications/{id}/ — delete a medication
+        - DELETE /medications/{id}/ — delete a medication; its logs and
+          notes are purged by a background job
         - GET /medications/{id}/info/ — fetch external drug info from OpenFDA
+        - GET /medications/suggest/?prefix=... — name autocomplete
+        - GET /medications/{id}/missed/?start=...&end=... — missed doses
+        - GET /medications/missed/?start=...&end=... — missed doses for all medications
+
+    The `missed` endpoints are rate limited and admission controlled as
+    heavy "analytics" requests, and `info` under the "external" limit.
     """
     queryset = Medication.objects.all()
     serializer_class = MedicationSerializer
+    throttle_scopes = {
+        "missed_doses": "analytics",
+        "missed_doses_bulk": "analytics",
+        "get_external_info": "external",
+    }
+    MAX_MISSED_DAYS = 366
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        enqueue("warm_drug_info", owner=self.get_owner(), medication_id=serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        # Hide the medication now and purge its history in the background,
+        # instead of collecting every log and note in this request.
+        with transaction.atomic():
+            instance.soft_delete()
+            enqueue("purge_medication", owner=instance.owner, medication_id=instance.pk)
+
+    def _missed_doses_params(self, request):
+        """
+        Parse the `start`, `end` and `tolerance` query parameters.
+
+        Raises:
+            ValidationError: If a parameter is missing or invalid.
+        """
+        start = parse_date(request.query_params.get("start") or "")
+        end = parse_date(request.query_params.get("end") or "")
+        if not start or not end:
+            raise ValidationError(
+                {"error": "Both 'start' and 'end' query parameters are required and must be valid dates."}
+            )
+        if start > end:
+            raise ValidationError({"error": "'start' must be before or equal to 'end'."})
+        if (end - start).days >= self.MAX_MISSED_DAYS:
+            raise ValidationError(
+                {"error": f"The period must not be longer than {self.MAX_MISSED_DAYS} days."}
+            )
+
+        tolerance = request.query_params.get("tolerance")
+        if tolerance is not None:
+            try:
+                tolerance = int(tolerance)
+            except ValueError:
+                tolerance = -1
+            if not 0 <= tolerance <= MAX_TOLERANCE_MINUTES:
+                raise ValidationError(
+                    {"error": f"The 'tolerance' parameter must be between 0 and {MAX_TOLERANCE_MINUTES} minutes."}
+                )
+        return start, end, tolerance
+
+    @action(detail=True, methods=["get"], url_path="missed")
+    def missed_doses(self, request, pk=None):
+        """
+        List the scheduled doses of a medication that were not taken.
+
+        The medication's `prescribed_per_day` is expanded into evenly
+        spaced slots for every day of the period, and each slot counts as
+        taken if a dose was logged within the tolerance window around it.
+
+        Query Parameters:
+            - start, end (YYYY-MM-DD): Inclusive period of at most
+              `MAX_MISSED_DAYS` days (required).
+            - tolerance (int): Minutes a dose may be early or late, at most
+              24 hours (optional, defaults to half the spacing between doses).
+
+        Returns:
+            Response:
+                - 200 OK: expected, taken and missed_count totals and the
+                  list of missed slot times.
+                - 400 BAD REQUEST: If a parameter is missing or invalid.
+
+        Example:
+            GET /medications/1/missed/?start=2025-11-01&end=2025-11-07
+        """
+        start, end, tolerance = self._missed_doses_params(request)
+        medication = self.get_object()
+        report = missed_doses_report([medication], start, end, tolerance)[0]
+        return Response({"start": start, "end": end, **report})
+
+    @action(detail=False, methods=["get"], url_path="missed")
+    def missed_doses_bulk(self, request):
+        """
+        Summarize missed doses for all of the user's medications.
+
+        Uses a single dose log query for every medication; see
+        `missed_doses` for the parameters and matching rules.
+
+        Returns:
+            Response:
+                - 200 OK: The period and one report per medication.
+                - 400 BAD REQUEST: If a parameter is missing or invalid.
+
+        Example:
+            GET /medications/missed/?start=2025-11-01&end=2025-11-07
+        """
+        start, end, tolerance = self._missed_doses_params(request)
+        medications = self.get_queryset().only("id", "prescribed_per_day")
+        report = missed_doses_report(medications, start, end, tolerance)
+        return Response({"start": start, "end": end, "medications": report})
+
+    @action(detail=False, methods=["get"], url_path="suggest")
+    def suggest(self, request):
+        """
+        Suggest medications whose name starts with the given prefix.
+
+        Answered with the indexed `name__istartswith` query, or from the
+        in-process `medication_names` index when
+        `MEDICATION_SUGGEST_BACKEND` is set to "memory".
+
+        Query Parameters:
+            - prefix (str): Beginning of the medication name (required).
+            - limit (int): Maximum number of suggestions, 1-50 (default 10).
+
+        Returns:
+            Response:
+                - 200 OK: A list of {id, name} objects ordered by name.
+                - 400 BAD REQUEST: If prefix is missing or limit is invalid.
+
+        Example:
+            GET /medications/suggest/?prefix=ibu
+        """
+        prefix = request.query_params.get("prefix", "").strip()
+        if not prefix:
+            return Response(
+                {"error": "The 'prefix' query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 50:
+            return Response(
+                {"error": "The 'limit' parameter must be an integer between 1 and 50."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if settings.MEDICATION_SUGGEST_BACKEND == "database":
+            suggestions = list(
+                self.get_queryset()
+                .filter(name__istartswith=prefix)
+                .order_by("name")
+                .values("id", "name")[:limit]
+            )
+        else:
+            owner = self.get_owner()
+            suggestions = medication_names.suggest(prefix, limit, owner_id=owner and owner.pk)
+        return Response(suggestions)
 
     @action(detail=True, methods=["get"], url_path="info")
     def get_external_info(self, request, pk=None):
@@ -100,7 +387,9 @@ class MedicationViewSet(viewsets.ModelViewSet):
         })
 
 
-class DoseLogViewSet(viewsets.ModelViewSet):
+class DoseLogViewSet(
+    OwnerScopedMixin, MedicationExpansionMixin, ConcurrencyLimitMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for viewing and managing dose logs.
 
@@ -116,9 +405,22 @@ class DoseLogViewSet(viewsets.ModelViewSet):
         - DELETE /logs/{id}/ — delete a dose log
         - GET /logs/filter/?start=YYYY-MM-DD&end=YYYY-MM-DD —
           filter logs within a date range
+        - POST /logs/export/ — queue a CSV export as a background job
+        - GET /logs/stream/ — live create/update events (see `dose_event_stream`)
+
+    Read endpoints accept `?expand=medication` to inline the medication's
+    name and dosage, and `?fields=id,taken_at,...` for sparse output.
+    Besides JSON, responses can be requested as MessagePack
+    (`Accept: application/msgpack`) or column-oriented JSON
+    (`Accept: application/vnd.medtracker.columnar+json`), and MessagePack
+    request bodies are accepted. `filter` and `export` are rate limited
+    and admission controlled as heavy "analytics" requests.
     """
-    queryset = DoseLog.objects.all()
+    queryset = DoseLog.objects.filter(medication__deleted_at__isnull=True)
     serializer_class = DoseLogSerializer
+    throttle_scopes = {"filter_by_date": "analytics", "export": "analytics"}
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer, ColumnarJSONRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
 
     @action(detail=False, methods=["get"], url_path="filter")
     def filter_by_date(self, request):
@@ -155,16 +457,73 @@ class DoseLogViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        lower, upper = day_range(start, end)
         logs = self.get_queryset().filter(
-            taken_at__date__gte=start,
-            taken_at__date__lte=end
+            taken_at__gte=lower,
+            taken_at__lt=upper
         ).order_by("taken_at")
 
         serializer = self.get_serializer(logs, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"], url_path="export")
+    def export(self, request):
+        """
+        Queue an asynchronous CSV export of the user's dose logs.
+
+        Body / Query Parameters:
+            - medication (int): Only export logs for this medication (optional).
+            - start, end (YYYY-MM-DD): Inclusive date range (optional, both or neither).
 
-class NoteViewSet(viewsets.ModelViewSet):
+        Returns:
+            Response:
+                - 202 ACCEPTED: The queued job's id, status and status URL.
+                - 400 BAD REQUEST: If the parameters are invalid.
+
+        Example:
+            POST /logs/export/?start=2025-01-01&end=2025-12-31
+        """
+        params = request.data or request.query_params
+        if not isinstance(params, Mapping):
+            return Response(
+                {"error": "The request body must be an object."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        payload = {}
+
+        medication_param = params.get("medication")
+        if medication_param:
+            try:
+                payload["medication"] = int(medication_param)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "The 'medication' parameter must be a valid integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        start_param, end_param = params.get("start"), params.get("end")
+        if start_param or end_param:
+            start = parse_date(str(start_param or ""))
+            end = parse_date(str(end_param or ""))
+            if not start or not end:
+                return Response(
+                    {"error": "Both 'start' and 'end' must be valid dates when filtering by date."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            payload["start"], payload["end"] = start.isoformat(), end.isoformat()
+
+        job = enqueue("export_doselogs", owner=self.get_owner(), **payload)
+        return Response(
+            {
+                "job": job.pk,
+                "status": job.status,
+                "url": reverse("job-detail", args=[job.pk]),
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class NoteViewSet(OwnerScopedMixin, MedicationExpansionMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing notes.
 
@@ -177,7 +536,387 @@ class NoteViewSet(viewsets.ModelViewSet):
         - POST /notes/ — create a new note
         - GET /notes/{id}/ — retrieve a specific note
         - DELETE /notes/{id}/ — delete a note
+        - GET /notes/search/?q=...&medication={id} — full-text search,
+          ranked and paginated
+
+    Read endpoints accept `?expand=medication` to inline the medication's
+    name and dosage, and `?fields=id,text,...` for sparse output.
     """
-    queryset = Note.objects.all()
+    queryset = Note.objects.filter(medication__deleted_at__isnull=True).defer("search_vector")
     serializer_class = NoteSerializer
     http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Search notes by text, best matches first.
+
+        Query Parameters:
+            - q (str): Search text (required).
+            - medication (int): Restrict results to one medication (optional).
+            - page, page_size (int): Pagination controls (optional).
+
+        Returns:
+            Response:
+                - 200 OK: A paginated list of matching notes.
+                - 400 BAD REQUEST: If q is missing or medication is not an integer.
+
+        Example:
+            GET /notes/search/?q=headache&medication=1
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "The 'q' query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        notes = self.get_queryset().search(query)
+
+        medication_param = request.query_params.get("medication")
+        if medication_param:
+            try:
+                notes = notes.filter(medication_id=int(medication_param))
+            except ValueError:
+                return Response(
+                    {"error": "The 'medication' parameter must be a valid integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        paginator = NoteSearchPagination()
+        page = paginator.paginate_queryset(notes, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class JobViewSet(OwnerScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for checking the status of background jobs.
+
+    Jobs are created by other endpoints (for example `POST /logs/export/`)
+    and executed by the `process_jobs` management command.
+
+    Endpoints:
+        - GET /jobs/ — list the user's jobs
+        - GET /jobs/{id}/ — retrieve a job's status and result
+        - GET /jobs/{id}/download/ — download the file produced by an export job
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        """
+        Download the file produced by a finished export job.
+
+        Returns:
+            Response:
+                - 200 OK: The export file as an attachment.
+                - 404 NOT FOUND: If the job produced no file.
+                - 409 CONFLICT: If the job has not finished successfully.
+
+        Example:
+            GET /jobs/3/download/
+        """
+        job = self.get_object()
+        if job.status != Job.SUCCEEDED:
+            return Response(
+                {"error": f"Job is {job.status}."},
+                status=status.HTTP_409_CONFLICT
+            )
+        filename = (job.result or {}).get("file")
+        path = settings.EXPORT_ROOT / filename if filename else None
+        if path is None or not path.exists():
+            return Response(
+                {"error": "This job has no downloadable file."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=filename)
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """
+    API endpoint for incremental (delta) sync of offline clients.
+
+    Every save of a Medication, DoseLog or Note stamps it with a value of
+    a global, increasing change sequence, and every deletion leaves a
+    Tombstone with its own value. A client stores the `token` of its
+    last sync and passes it back as `since`, so each sync reads only the
+    rows changed after it, via the `(owner, change_seq)` indexes.
+
+    Endpoints:
+        - GET /sync/?since={token} — rows changed and deleted after `token`
+
+    Sequence values are allocated before the saving transaction commits,
+    so a slow transaction may commit a lower value after a higher one is
+    visible. Responses therefore stop at `safe_change_seq()`, below which
+    every change has committed; later changes are returned by the next
+    sync. Medications and notes changed with `QuerySet.update()` are
+    not tracked.
+    """
+
+    def list(self, request):
+        """
+        Return rows changed since a sync token.
+
+        Each response holds at most `SYNC_PAGE_SIZE` rows per table.
+        When `has_more` is true, the client should immediately request
+        the next page with the returned token.
+
+        Query Parameters:
+            - since (int): The token of the previous sync; 0 or omitted
+              for a full sync.
+
+        Returns:
+            Response:
+                - 200 OK: `token`, `has_more`, the changed `medications`,
+                  `logs` and `notes`, and the ids of `deleted` rows per
+                  table.
+                - 400 BAD REQUEST: If since is not a non-negative integer.
+
+        Example:
+            GET /sync/?since=1042
+        """
+        try:
+            since = int(request.query_params.get("since", 0))
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"error": "The 'since' parameter must be a non-negative integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = settings.SYNC_PAGE_SIZE
+        user = request.user
+        # Read before the rows, so that everything up to it is visible.
+        safe = safe_change_seq()
+        sources = {
+            "medications": Medication.objects.for_owner(user),
+            "logs": DoseLog.objects.for_owner(user).filter(medication__deleted_at__isnull=True),
+            "notes": Note.objects.for_owner(user)
+            .filter(medication__deleted_at__isnull=True)
+            .defer("search_vector"),
+            "deleted": Tombstone.objects.for_owner(user),
+        }
+        changes = Q(change_seq__gt=since)
+        if safe is not None:
+            changes &= Q(change_seq__lte=safe)
+        rows = {
+            key: list(queryset.filter(changes).order_by("change_seq")[:limit + 1])
+            for key, queryset in sources.items()
+        }
+
+        # A table with more rows than fit on the page is complete only up
+        # to its last returned row; cut every table at the lowest such
+        # point so that the token never skips a change.
+        truncated = [batch[limit - 1].change_seq for batch in rows.values() if len(batch) > limit]
+        if truncated:
+            token = min(truncated)
+            rows = {
+                key: [row for row in batch if row.change_seq <= token]
+                for key, batch in rows.items()
+            }
+        else:
+            token = max((batch[-1].change_seq for batch in rows.values() if batch), default=since)
+
+        context = {"request": request}
+        deleted = {"medications": [], "logs": [], "notes": []}
+        kinds = {
+            Tombstone.MEDICATION: "medications",
+            Tombstone.DOSELOG: "logs",
+            Tombstone.NOTE: "notes",
+        }
+        for tombstone in rows["deleted"]:
+            deleted[kinds[tombstone.kind]].append(tombstone.object_id)
+
+        return Response({
+            "token": token,
+            "has_more": bool(truncated),
+            "medications": MedicationSerializer(
+                rows["medications"], many=True, context=context
+            ).data,
+            "logs": DoseLogSerializer(rows["logs"], many=True, context=context).data,
+            "notes": NoteSerializer(rows["notes"], many=True, context=context).data,
+            "deleted": deleted,
+        })
+
+
+class DashboardViewSet(ConcurrencyLimitMixin, viewsets.ViewSet):
+    """
+    API endpoint returning everything a patient dashboard shows at once.
+
+    Replaces a medications request followed by per-medication
+    `expected-doses`, `logs/filter` and `notes` requests. The response is
+    built with a constant number of queries however many medications
+    the user has: one for the medications with their period counts
+    (a correlated subquery per medication, answered from the
+    `(owner, medication, taken_at)` index range), and one each for the
+    most recent logs and notes, fetched with sliced prefetches (a
+    `ROW_NUMBER()` window).
+
+    Endpoints:
+        - GET /dashboard/?days=7&recent=5 — medications with adherence,
+          expected and taken doses over the period, and recent logs and notes
+
+    The dashboard is rate limited and admission controlled as a heavy
+    "analytics" request.
+    """
+    throttle_scopes = {"list": "analytics"}
+
+    MAX_DAYS = 366
+    MAX_RECENT = 20
+
+    def _int_param(self, request, name, default, maximum):
+        value = request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            value = 0
+        if not 1 <= value <= maximum:
+            raise ValidationError(
+                {"error": f"The '{name}' parameter must be an integer between 1 and {maximum}."}
+            )
+        return value
+
+    def list(self, request):
+        """
+        Return the dashboard for the requesting user.
+
+        Query Parameters:
+            - days (int): Length of the period ending today (default 7).
+            - recent (int): Logs and notes to include per medication (default 5).
+
+        Returns:
+            Response:
+                - 200 OK: The period bounds and a list of medications, each
+                  with `expected_doses`, `taken_doses`, `period_adherence`,
+                  `recent_logs` and `recent_notes`.
+                - 400 BAD REQUEST: If days or recent is out of range.
+
+        Example:
+            GET /dashboard/?days=7
+        """
+        days = self._int_param(request, "days", 7, self.MAX_DAYS)
+        recent = self._int_param(request, "recent", 5, self.MAX_RECENT)
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        lower, upper = day_range(start, end)
+
+        taken_in_period = (
+            DoseLog.objects.for_owner(request.user)
+            .filter(
+                medication=OuterRef("pk"),
+                was_taken=True,
+                taken_at__gte=lower,
+                taken_at__lt=upper,
+            )
+            .order_by()
+            .values("medication")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        medications = (
+            Medication.objects.for_owner(request.user)
+            .annotate(taken_in_period=Coalesce(
+                Subquery(taken_in_period, output_field=IntegerField()), 0
+            ))
+            .prefetch_related(
+                Prefetch(
+                    "doselog_set",
+                    queryset=DoseLog.objects.order_by("-taken_at", "-id")[:recent],
+                    to_attr="recent_logs",
+                ),
+                Prefetch(
+                    "note_set",
+                    queryset=Note.objects.defer("search_vector").order_by("-created_at", "-id")[:recent],
+                    to_attr="recent_notes",
+                ),
+            )
+            .order_by("name", "id")
+        )
+        serializer = DashboardMedicationSerializer(
+            medications, many=True, context={"request": request, "days": days}
+        )
+        return Response({
+            "days": days,
+            "start": start,
+            "end": end,
+            "medications": serializer.data,
+        })
+
+
+def _authenticate(request):
+    """
+    Authenticate a plain Django request like an API view would.
+
+    Runs the `DEFAULT_AUTHENTICATION_CLASSES`, so clients using Basic or
+    token authentication are recognized, not only session cookies.
+
+    Returns:
+        tuple[int | None, JsonResponse | None]: The user id (None when
+        anonymous) and, if the credentials were rejected, the error
+        response to send instead.
+    """
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    drf_request = Request(request, authenticators=authenticators)
+    try:
+        user = drf_request.user
+    except (AuthenticationFailed, NotAuthenticated) as exc:
+        # Same status as APIView: 401 only if there is a challenge to send.
+        response = JsonResponse({"error": str(exc.detail)}, status=status.HTTP_403_FORBIDDEN)
+        header = authenticators[0].authenticate_header(drf_request) if authenticators else None
+        if header:
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response["WWW-Authenticate"] = header
+        return None, response
+    return (user.pk if user.is_authenticated else None), None
+
+
+async def dose_event_stream(request):
+    """
+    Stream dose log create/update events as Server-Sent Events.
+
+    An asynchronous view, so under ASGI (`medtracker/asgi.py`) each idle
+    connection costs a suspended coroutine rather than a worker thread.
+    Requests are authenticated with the API's authentication classes
+    and events are scoped to the requesting user's dose logs.
+
+    Query Parameters:
+        - medication (int): Only stream events for this medication (optional).
+
+    Returns:
+        StreamingHttpResponse: A `text/event-stream` of `created` and
+        `updated` events whose data is the serialized DoseLog,
+        400 BAD REQUEST if medication is not an integer, or 401/403 if
+        the supplied credentials are invalid.
+
+    Example:
+        GET /logs/stream/?medication=1
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    medication_id = None
+    medication_param = request.GET.get("medication")
+    if medication_param:
+        try:
+            medication_id = int(medication_param)
+        except ValueError:
+            return JsonResponse(
+                {"error": "The 'medication' parameter must be a valid integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    owner_id, error = await sync_to_async(_authenticate)(request)
+    if error is not None:
+        return error
+    response = StreamingHttpResponse(
+        event_stream(owner_id, medication_id, settings.DOSE_EVENTS_KEEPALIVE),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response